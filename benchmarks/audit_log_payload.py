@@ -0,0 +1,85 @@
+"""Compare bytes sent and encode time of the `POST /create-bulk` payload modes.
+
+Usage: poetry run python benchmarks/audit_log_payload.py [--sizes 10000,100000,1000000]
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from python_playground.utils.audit_log_payload import (
+    get_serializer,
+    iter_payload,
+    orjson,
+    zstandard,
+)
+
+
+def build_entries(count: int) -> List[Dict[str, Any]]:
+    """Repetitive audit traffic, like the one seen in production."""
+    actions = ("update", "delete-all", "create", "login")
+    return [
+        {
+            "event_name": "role_update",
+            "application_name": "intranet",
+            "module": "login-frontend",
+            "action": actions[i % len(actions)],
+            "user_id": i % 1000,
+            "request_id": f"req-{i}",
+        }
+        for i in range(count)
+    ]
+
+
+def baseline(entries: List[Dict[str, Any]]) -> int:
+    """What `session.post(json=...)` does today: one big JSON string."""
+    return len(json.dumps(entries, allow_nan=False).encode())
+
+
+def streamed(
+    payload_format: str, compression: Optional[str], serializer: Optional[str]
+) -> Callable[[List[Dict[str, Any]]], int]:
+    dumps = get_serializer(serializer)
+
+    def run(entries: List[Dict[str, Any]]) -> int:
+        return sum(
+            len(chunk)
+            for chunk in iter_payload(entries, payload_format, compression, serializer=dumps)
+        )
+
+    return run
+
+
+def modes() -> List[Tuple[str, Callable[[List[Dict[str, Any]]], int]]]:
+    serializers = ["json"] + (["orjson"] if orjson is not None else [])
+    compressions: List[Optional[str]] = [None, "gzip"] + (["zstd"] if zstandard else [])
+    result: List[Tuple[str, Callable[[List[Dict[str, Any]]], int]]] = [
+        ("json.dumps(list) (current)", baseline)
+    ]
+    for serializer in serializers:
+        for payload_format in ("json", "ndjson"):
+            for compression in compressions:
+                name = f"{payload_format}/{compression or 'identity'}/{serializer}"
+                result.append((name, streamed(payload_format, compression, serializer)))
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Audit log payload benchmark")
+    parser.add_argument("--sizes", default="10000,100000,1000000", type=str)
+    args = parser.parse_args()
+
+    for size in (int(value) for value in args.sizes.split(",")):
+        entries = build_entries(size)
+        print(f"\n{size} events")
+        print(f"{'mode':<32} {'bytes':>14} {'encode (s)':>12}")
+        for name, run in modes():
+            start = time.perf_counter()
+            sent = run(entries)
+            elapsed = time.perf_counter() - start
+            print(f"{name:<32} {sent:>14,} {elapsed:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
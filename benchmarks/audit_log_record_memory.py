@@ -0,0 +1,67 @@
+"""Compare the memory held by buffered audit log events: list of dicts vs. `AuditLogRecord`.
+
+Usage: poetry run python benchmarks/audit_log_record_memory.py [--events 1000000]
+"""
+
+import argparse
+import gc
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from python_playground.utils.audit_log_record import AuditLogRecord
+
+EVENT_NAMES = ("role_update", "role_delete", "role_create")
+ACTIONS = ("update", "delete-all", "create")
+
+
+def as_dicts(count: int) -> List[Any]:
+    """Today's representation: a new dict per event (strings built at runtime, not interned)."""
+    entries: List[Dict[str, Any]] = []
+    for i in range(count):
+        audit_log = {
+            "event_name": "".join(EVENT_NAMES[i % 3]),
+            "application_name": "".join("intranet"),
+            "module": "".join("login-frontend"),
+            "action": "".join(ACTIONS[i % 3]),
+        }
+        entries.append(audit_log)
+    return entries
+
+
+def as_records(count: int) -> List[Any]:
+    return [
+        AuditLogRecord(
+            "".join(EVENT_NAMES[i % 3]),
+            "".join("intranet"),
+            "".join("login-frontend"),
+            "".join(ACTIONS[i % 3]),
+        )
+        for i in range(count)
+    ]
+
+
+def measure(build: Callable[[int], List[Any]], count: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+    entries = build(count)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del entries
+    return current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Audit log record memory benchmark")
+    parser.add_argument("--events", default=1_000_000, type=int)
+    args = parser.parse_args()
+
+    baseline = measure(as_dicts, args.events)
+    compact = measure(as_records, args.events)
+    print(f"{args.events} buffered events")
+    print(f"{'list of dicts':<20} {baseline / 1024 / 1024:>10.1f} MiB")
+    print(f"{'AuditLogRecord':<20} {compact / 1024 / 1024:>10.1f} MiB")
+    print(f"{'saved':<20} {(1 - compact / baseline) * 100:>10.1f} %")
+
+
+if __name__ == "__main__":
+    main()
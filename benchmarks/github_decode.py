@@ -0,0 +1,174 @@
+"""Compare decoding GitHub API responses: parse -> dict -> dumps vs. cached TypeAdapters.
+
+Usage: poetry run python benchmarks/github_decode.py [--runs 2000]
+"""
+
+import argparse
+import json
+import time
+import warnings
+from typing import Any, Callable, Dict, List, Tuple
+
+from pydantic import parse_obj_as
+
+from python_playground.models.github_stats import (
+    GitHubUserData,
+    RateLimitData,
+    TrafficClonesData,
+    TrafficPopularPathsData,
+    TrafficPopularReferrersData,
+    TrafficViewsData,
+)
+from python_playground.utils.github_decode import decode, dump
+
+RATE_LIMIT_ITEM = {"limit": 5000, "used": 12, "remaining": 4988, "reset": 1704067200}
+RATE_LIMIT_RESOURCES = (
+    "core",
+    "search",
+    "graphql",
+    "integration_manifest",
+    "source_import",
+    "code_scanning_upload",
+    "actions_runner_registration",
+    "scim",
+    "dependency_snapshots",
+    "audit_log",
+    "code_search",
+)
+DAYS = [
+    {"timestamp": f"2024-01-{day:02d}T00:00:00Z", "count": day * 7, "uniques": day}
+    for day in range(1, 15)
+]
+USER = {
+    "login": "octocat",
+    "id": 1,
+    "node_id": "MDQ6VXNlcjE=",
+    "avatar_url": "https://github.com/images/error/octocat_happy.gif",
+    "gravatar_id": "",
+    "url": "https://api.github.com/users/octocat",
+    "html_url": "https://github.com/octocat",
+    "followers_url": "https://api.github.com/users/octocat/followers",
+    "following_url": "https://api.github.com/users/octocat/following{/other_user}",
+    "gists_url": "https://api.github.com/users/octocat/gists{/gist_id}",
+    "starred_url": "https://api.github.com/users/octocat/starred{/owner}{/repo}",
+    "subscriptions_url": "https://api.github.com/users/octocat/subscriptions",
+    "organizations_url": "https://api.github.com/users/octocat/orgs",
+    "repos_url": "https://api.github.com/users/octocat/repos",
+    "events_url": "https://api.github.com/users/octocat/events{/privacy}",
+    "received_events_url": "https://api.github.com/users/octocat/received_events",
+    "type": "User",
+    "site_admin": False,
+    "name": "monalisa octocat",
+    "company": "GitHub",
+    "blog": "https://github.com/blog",
+    "location": "San Francisco",
+    "email": "octocat@github.com",
+    "hireable": False,
+    "bio": "There once was...",
+    "twitter_username": "monatheoctocat",
+    "public_repos": 2,
+    "public_gists": 1,
+    "followers": 20,
+    "following": 0,
+    "created_at": "2008-01-14T04:33:35Z",
+    "updated_at": "2008-01-14T04:33:35Z",
+}
+
+# One response body per metrics data item, as `github_stats` fetches them.
+RESPONSES: List[Tuple[Any, bytes]] = [
+    (GitHubUserData, json.dumps(USER).encode()),
+    (
+        RateLimitData,
+        json.dumps(
+            {
+                "resources": dict.fromkeys(RATE_LIMIT_RESOURCES, RATE_LIMIT_ITEM),
+                "rate": RATE_LIMIT_ITEM,
+            }
+        ).encode(),
+    ),
+    (TrafficViewsData, json.dumps({"count": 735, "uniques": 105, "views": DAYS}).encode()),
+    (TrafficClonesData, json.dumps({"count": 735, "uniques": 105, "clones": DAYS}).encode()),
+    (
+        List[TrafficPopularPathsData],
+        json.dumps(
+            [
+                {"path": f"/octocat/repo/{i}", "title": f"Page {i}", "count": i, "uniques": i}
+                for i in range(10)
+            ]
+        ).encode(),
+    ),
+    (
+        List[TrafficPopularReferrersData],
+        json.dumps(
+            [{"referrer": f"site{i}.com", "count": i, "uniques": i} for i in range(10)]
+        ).encode(),
+    ),
+]
+
+
+class CustomJSONEncoder(json.JSONEncoder):
+    """The encoder `github_stats` used for the `HttpUrl`s left in `.dict()`."""
+
+    def default(self, obj: Any) -> Any:
+        if hasattr(obj, "scheme"):
+            return obj.__str__()
+        return json.JSONEncoder.default(self, obj)
+
+
+def round_trip() -> str:
+    """Previous pipeline: response.json() -> parse_obj_as() -> .dict() -> json.dumps()."""
+    stdout: Dict[str, Any] = {}
+    for index, (data_type, body) in enumerate(RESPONSES):
+        data = parse_obj_as(data_type, json.loads(body))
+        stdout[str(index)] = (
+            [item.dict() for item in data] if isinstance(data, list) else data.dict()
+        )
+    return json.dumps(stdout, indent=2, cls=CustomJSONEncoder)
+
+
+def validated() -> str:
+    stdout = {
+        str(i): dump(decode(data_type, body)) for i, (data_type, body) in enumerate(RESPONSES)
+    }
+    return json.dumps(stdout, indent=2)
+
+
+def loads_only() -> str:
+    """Reference without any models: what an unvalidated mode could at best get down to."""
+    stdout = {str(i): json.loads(body) for i, (_, body) in enumerate(RESPONSES)}
+    return json.dumps(stdout, indent=2)
+
+
+def measure(pipeline: Callable[[], str], runs: int) -> float:
+    pipeline()
+    start = time.perf_counter()
+    for _ in range(runs):
+        pipeline()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="GitHub response decoding benchmark")
+    parser.add_argument("--runs", default=2000, type=int)
+    args = parser.parse_args()
+
+    # `parse_obj_as()` is deprecated in pydantic v2, that's the point of this comparison.
+    warnings.simplefilter("ignore", DeprecationWarning)
+
+    baseline = measure(round_trip, args.runs)
+    print(f"{args.runs} runs of {len(RESPONSES)} responses each")
+    print(f"{'pipeline':<34}{'seconds':>10}{'per run':>12}{'speedup':>10}")
+    for name, pipeline in (
+        ("parse -> dict -> dumps", round_trip),
+        ("cached TypeAdapter", validated),
+        ("json.loads only (no validation)", loads_only),
+    ):
+        elapsed = baseline if pipeline is round_trip else measure(pipeline, args.runs)
+        print(
+            f"{name:<34}{elapsed:>10.3f}{elapsed / args.runs * 1e6:>10.1f}us"
+            f"{baseline / elapsed:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Track the cold-start cost of `github_stats` with `python -X importtime`.
+
+Usage: poetry run python benchmarks/github_stats_import_time.py [--runs 10] [--top 10]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+MODULE = "python_playground.utils.github_stats"
+
+
+def import_times(statement: str, nested: bool = False) -> Dict[str, int]:
+    """Cumulative import time in microseconds of the (top-level) imports of a statement."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or line.count("|") != 2:
+            continue
+        _, cumulative, name = line.split("|")
+        # Nested imports are indented, their time is already part of their parent's.
+        if cumulative.strip().isdigit() and (nested or not name[1:].startswith(" ")):
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def wall_time(args: List[str]) -> float:
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, *args], stdin=subprocess.DEVNULL, capture_output=True, check=True
+    )
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="github_stats import time benchmark")
+    parser.add_argument("--runs", default=10, type=int)
+    parser.add_argument("--top", default=10, help="Show the N slowest imports", type=int)
+    args = parser.parse_args()
+
+    # Imported by the interpreter itself on start-up, not by github_stats.
+    startup = set(import_times("pass", nested=True))
+    scenarios: List[Tuple[str, str]] = [
+        ("import github_stats", f"import {MODULE}"),
+        # Pulls in requests, pydantic and the models, as every collection run does.
+        ("first GitHubApiClient", f"import {MODULE} as g; g.GitHubApiClient('', '', '', '')"),
+    ]
+    print(f"{'scenario':<28}{'median ms':>12}{'min ms':>10}")
+    for name, statement in scenarios:
+        samples = [
+            sum(
+                micros
+                for module, micros in import_times(statement).items()
+                if module not in startup
+            )
+            for _ in range(args.runs)
+        ]
+        print(f"{name:<28}{statistics.median(samples) / 1000:>12.1f}{min(samples) / 1000:>10.1f}")
+
+    help_times = [wall_time(["-m", MODULE, "--help"]) for _ in range(args.runs)]
+    print(f"{'github_stats --help (wall)':<28}{statistics.median(help_times) * 1000:>12.1f}")
+
+    print(f"\nSlowest imports of `import {MODULE}`:")
+    slowest = sorted(
+        (item for item in import_times(f"import {MODULE}", True).items() if item[0] not in startup),
+        key=lambda item: -item[1],
+    )
+    for module, micros in slowest[: args.top]:
+        print(f"{micros / 1000:>8.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Parse time per page of Medium articles: the previous inline extraction vs. the parser backends.
+
+The fixtures in `benchmarks/fixtures/` hold the `<article>`s of one scroll of a blog, as
+`medium_blog` hands them to the parser.
+
+Usage: poetry run python benchmarks/medium_parser.py [--runs 200] [--fixture medium_*.html]
+"""
+
+import argparse
+import glob
+import os
+import re
+import time
+from typing import Callable, Dict, List
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+
+from python_playground.web_scraping.medium_parser import (
+    available_backends,
+    parse_articles,
+)
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+BLOG_URL = "https://rschu.me"
+
+
+def previous_extraction(html: str, blog_url: str) -> List[Dict[str, str]]:
+    """The extraction as it was inlined in `medium_blog.main()`, including its date pattern."""
+    articles_data = []
+    soup = BeautifulSoup(html, "html.parser")
+    for article in soup.find_all("article"):
+        link_url = ""
+        publishing_date = "not-found"
+        for link in article.find_all("a"):
+            href = link.get("href")
+            if href and href.startswith("/"):
+                link_url = urljoin(blog_url, urlparse(href).path)
+                break
+        date_pattern = re.compile(
+            r"\bJan|Feb|Mar|Apr|May|Jun|Jul|" r"Aug|Sep|Oct|Nov|Dec\b \d{1,2}, \d{4}"
+        )
+        date_tag = article.find(string=date_pattern)
+        if date_tag:
+            publishing_date = date_tag
+        title = article.find("h2")
+        if title:
+            articles_data.append(
+                {"title": title.text, "link": link_url, "published": publishing_date}
+            )
+    return articles_data
+
+
+def measure(parse: Callable[[], List[Dict[str, str]]], runs: int) -> float:
+    parse()
+    start = time.perf_counter()
+    for _ in range(runs):
+        parse()
+    return (time.perf_counter() - start) / runs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Medium article parser benchmark")
+    parser.add_argument("--runs", default=200, type=int)
+    parser.add_argument("--fixture", default="medium_*.html", help="Glob in benchmarks/fixtures")
+    args = parser.parse_args()
+
+    for path in sorted(glob.glob(os.path.join(FIXTURES, args.fixture))):
+        with open(path, "r", encoding="utf-8") as f:
+            html = f.read()
+        expected = parse_articles(html, BLOG_URL, "html.parser")
+        print(f"\n{os.path.basename(path)}: {len(expected)} articles, {len(html) // 1024} KiB")
+        print(f"{'parser':<24}{'ms per page':>12}{'speedup':>10}")
+
+        baseline = measure(lambda: previous_extraction(html, BLOG_URL), args.runs)
+        print(f"{'previous (html.parser)':<24}{baseline * 1000:>12.2f}{1:>9.1f}x")
+        for backend in available_backends():
+            # All backends have to agree on the records, not only be fast.
+            if parse_articles(html, BLOG_URL, backend) != expected:
+                raise SystemExit(f"The {backend} backend extracted different articles.")
+            elapsed = measure(lambda: parse_articles(html, BLOG_URL, backend), args.runs)
+            print(f"{backend:<24}{elapsed * 1000:>12.2f}{baseline / elapsed:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
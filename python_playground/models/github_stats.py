@@ -161,3 +161,47 @@ class GitHubUserData(BaseModel):
     updated_at: str = Field(
         description="The ISO8601 timestamp of the last update to the user's profile."
     )
+
+
+class SimpleUserData(BaseModel):
+    login: str = Field(description="The user's GitHub login name.")
+    id: int = Field(description="The user's unique GitHub ID.")
+    html_url: HttpUrl = Field(description="The HTML URL of the user's GitHub profile.")
+    type: str = Field(description="The type of the account (User or Organization).")
+
+
+class ForkData(BaseModel):
+    id: int = Field(description="The unique ID of the fork.")
+    full_name: str = Field(description="The owner/repo name of the fork.")
+    owner: SimpleUserData = Field(description="The owner of the fork.")
+    html_url: HttpUrl = Field(description="The HTML URL of the fork.")
+    created_at: str = Field(description="When the fork was created.")
+    stargazers_count: int = Field(description="The number of stars of the fork.")
+    forks_count: int = Field(description="The number of forks of the fork.")
+
+
+class ReleaseAssetData(BaseModel):
+    name: str = Field(description="The file name of the asset.")
+    size: int = Field(description="The size of the asset in bytes.")
+    download_count: int = Field(description="How often the asset was downloaded.")
+    browser_download_url: HttpUrl = Field(description="The download URL of the asset.")
+
+
+class ReleaseData(BaseModel):
+    id: int = Field(description="The unique ID of the release.")
+    tag_name: str = Field(description="The name of the tag of the release.")
+    name: Optional[str] = Field(description="The title of the release.")
+    published_at: Optional[str] = Field(description="When the release was published.")
+    assets: List[ReleaseAssetData] = Field(description="The files attached to the release.")
+
+
+class RepositoryData(BaseModel):
+    full_name: str = Field(description="The owner/repo name of the repository.")
+    html_url: HttpUrl = Field(description="The HTML URL of the repository.")
+    description: Optional[str] = Field(description="The description of the repository.")
+    stargazers_count: int = Field(description="The number of stars of the repository.")
+    forks_count: int = Field(description="The number of forks of the repository.")
+    open_issues_count: int = Field(
+        description="The number of open issues, including pull requests.",
+    )
+    pushed_at: Optional[str] = Field(description="When the repository was last pushed to.")
@@ -0,0 +1,93 @@
+import json
+import logging
+import os
+import socket
+import threading
+from typing import Optional
+
+from python_playground.utils.audit_log_helper import AuditLogger
+
+logger = logging.getLogger(__name__)
+
+# Upper bound for a single event datagram.
+MAX_DATAGRAM_SIZE = 256 * 1024
+# How often the receiving thread checks whether it should stop.
+POLL_INTERVAL = 0.5
+
+
+class AuditLogAggregator:
+    """Collects audit log events from many local processes and batches them together.
+
+    Meant to run once per host, e.g. in the gunicorn master. Workers create their
+    `AuditLogger` with `aggregator_socket=...` and send every event as a single datagram
+    over a Unix socket; the aggregator hands them to its own background `AuditLogger`,
+    so the audit API sees one stream of batches instead of one per worker.
+    """
+
+    def __init__(self, socket_path: str, audit_logger: AuditLogger):
+        if not audit_logger.background:
+            raise ValueError("The aggregator requires an AuditLogger in background mode.")
+        if audit_logger.aggregator_socket:
+            raise ValueError("The aggregator's AuditLogger can't send to an aggregator itself.")
+        self.socket_path = socket_path
+        self.audit_logger = audit_logger
+        self._socket: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._pid = os.getpid()
+
+    def __enter__(self) -> "AuditLogAggregator":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def start(self) -> None:
+        """Bind the socket and receive events on a daemon thread."""
+        self._bind()
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="audit-log-aggregator", daemon=True
+        )
+        self._thread.start()
+
+    def serve_forever(self) -> None:
+        if self._socket is None:
+            self._bind()
+        sock = self._socket
+        assert sock is not None
+        while not self._stopped.is_set():
+            try:
+                datagram = sock.recv(MAX_DATAGRAM_SIZE)
+            except socket.timeout:
+                continue
+            except OSError:
+                # The socket was closed.
+                return
+            try:
+                self.audit_logger.log_event(**json.loads(datagram))
+            except Exception:
+                logger.exception("Invalid audit log event received by the aggregator")
+
+    def close(self) -> None:
+        """Stop receiving events, then flush and close the aggregator's AuditLogger."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+            # Forked children inherit the object, only the owner removes the socket file.
+            if os.getpid() == self._pid and os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+        self.audit_logger.close()
+
+    def _bind(self) -> None:
+        if os.path.exists(self.socket_path):
+            # Left over from a previous run.
+            os.remove(self.socket_path)
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._socket.bind(self.socket_path)
+        self._socket.settimeout(POLL_INTERVAL)
+        self._pid = os.getpid()
@@ -0,0 +1,214 @@
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import httpx
+
+from python_playground.utils.audit_log_metrics import AuditLogMetrics, MetricsHook
+from python_playground.utils.audit_log_payload import (
+    content_headers,
+    get_serializer,
+    iter_payload,
+    validate_payload_options,
+)
+from python_playground.utils.audit_log_record import AuditLogRecord
+from python_playground.utils.audit_log_retry import (
+    AuditLogApiError,
+    handle_bulk_response,
+    handle_request_error,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncAuditLogger:
+    """asyncio counterpart of `AuditLogger` built on a pooled `httpx.AsyncClient`."""
+
+    def __init__(
+        self,
+        api_url: str,
+        api_key: Union[str],
+        max_concurrent_requests: int = 4,
+        max_connections: int = 10,
+        timeout: float = 10.0,
+        payload_format: str = "json",
+        compression: Optional[str] = None,
+        serializer: Optional[str] = None,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        metrics_hook: Optional[MetricsHook] = None,
+    ):
+        self.api_url: str = api_url
+        self.audit_log_entries: List[Any] = []
+        self.client = httpx.AsyncClient(
+            headers={"x-api-key": f"{api_key}"} if api_key else {},
+            limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_connections
+            ),
+            timeout=timeout,
+        )
+        validate_payload_options(payload_format, compression)
+        self.payload_format = payload_format
+        self.compression = compression
+        self._dumps = get_serializer(serializer)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.metrics = AuditLogMetrics(metrics_hook)
+        self._max_request_events: Optional[int] = None
+        # Caps the number of bulk uploads in flight at the same time.
+        self._semaphore = asyncio.Semaphore(max_concurrent_requests)
+        self._pending: Set["asyncio.Task[Any]"] = set()
+
+    async def __aenter__(self) -> "AsyncAuditLogger":
+        return self
+
+    @property
+    def dropped_events(self) -> int:
+        return self.metrics.counter("events_dropped")
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of the logger's counters, histograms and current buffer depth."""
+        snapshot = self.metrics.snapshot()
+        snapshot["buffer_depth"] = len(self.audit_log_entries)
+        snapshot["pending_uploads"] = len(self._pending)
+        return snapshot
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def log_and_send_event(
+        self, event_name: str, application_name: str, module: str, action: str, **kwargs: Any
+    ) -> Any:
+        """Adds an event to the collection and sends it immediately."""
+        self.log_event(event_name, application_name, module, action, **kwargs)
+        return await self.send_batch()
+
+    def log_event(
+        self, event_name: str, application_name: str, module: str, action: str, **kwargs: Any
+    ) -> None:
+        entry = AuditLogRecord(event_name, application_name, module, action, kwargs)
+        self.metrics.increment("events_enqueued")
+        self.audit_log_entries.append(entry)
+
+    async def send_batch(self) -> Any:
+        """Sends collected audit logs and clears the internal collection."""
+        if not self.audit_log_entries:
+            return None
+        # Take ownership of the current batch so other tasks can keep logging meanwhile.
+        entries, self.audit_log_entries = self.audit_log_entries, []
+        try:
+            return await self._post_batch(entries)
+        except AuditLogApiError as e:
+            # Put the events the server didn't accept back in front of anything logged meanwhile.
+            if e.retryable:
+                self.audit_log_entries[:0] = e.failed_entries
+            else:
+                self.metrics.increment("events_dropped", len(e.failed_entries))
+            raise
+        except Exception:
+            self.audit_log_entries[:0] = entries
+            raise
+
+    def send_batch_nowait(self) -> Optional["asyncio.Task[Any]"]:
+        """Schedules `send_batch()` as a background task without awaiting it."""
+        if not self.audit_log_entries:
+            return None
+        task = asyncio.get_running_loop().create_task(self.send_batch())
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+        return task
+
+    async def aclose(self) -> None:
+        """Waits for in-flight uploads, sends the remaining events and closes the client."""
+        try:
+            if self._pending:
+                await asyncio.gather(*self._pending, return_exceptions=True)
+            try:
+                await self.send_batch()
+            except Exception:
+                logger.exception("Failed to send %d audit log events", len(self.audit_log_entries))
+            if self.audit_log_entries:
+                # Nothing is left to retry them after closing.
+                self.metrics.increment("events_dropped", len(self.audit_log_entries))
+                self.audit_log_entries = []
+        finally:
+            await self.client.aclose()
+
+    async def _post_batch(self, entries: List[Any]) -> Any:
+        """Send a batch with retries, see `AuditLogger._post_batch`."""
+        limit = self._max_request_events
+        if limit and len(entries) > limit:
+            response = None
+            for start in range(0, len(entries), limit):
+                end = start + limit
+                try:
+                    response = await self._post_batch(entries[start:end])
+                except AuditLogApiError as e:
+                    e.failed_entries.extend(entries[end:])
+                    raise
+            return response
+
+        pending = entries
+        attempt = 0
+        while True:
+            try:
+                response = await self._post_once(pending)
+            except httpx.TransportError as e:
+                outcome = handle_request_error(
+                    pending, e, attempt, self.metrics, *self._retry_options()
+                )
+            else:
+                outcome = handle_bulk_response(
+                    pending,
+                    response.status_code,
+                    response.headers,
+                    response.content,
+                    attempt,
+                    self.metrics,
+                    *self._retry_options(),
+                )
+            if outcome.too_large:
+                self._max_request_events = len(pending) // 2
+                return await self._post_batch(pending)
+            if outcome.error is None:
+                return outcome.body
+            if outcome.retry_delay is None:
+                raise outcome.error
+            await asyncio.sleep(outcome.retry_delay)
+            pending = outcome.retryable
+            attempt += 1
+
+    def _retry_options(self) -> Tuple[int, float, float]:
+        return self.max_retries, self.backoff_base, self.backoff_max
+
+    async def _post_once(self, entries: List[Any]) -> httpx.Response:
+        self.metrics.increment("requests")
+        self.metrics.observe("batch_size", len(entries))
+        content: Any
+        if self.payload_format == "json" and self.compression is None:
+            with self.metrics.timed("serialization_seconds"):
+                content = self._dumps(entries)
+        else:
+            content = _aiter_chunks(
+                self.metrics.timed_chunks(
+                    "serialization_seconds",
+                    iter_payload(
+                        entries, self.payload_format, self.compression, serializer=self._dumps
+                    ),
+                )
+            )
+        async with self._semaphore:
+            with self.metrics.timed("post_latency_seconds"):
+                return await self.client.post(
+                    f"{self.api_url}/create-bulk",
+                    content=content,
+                    headers=content_headers(self.payload_format, self.compression),
+                )
+
+
+async def _aiter_chunks(chunks: Iterable[bytes]) -> AsyncIterator[bytes]:
+    """Adapt a payload chunk iterator to the async streaming body httpx expects."""
+    for chunk in chunks:
+        yield chunk
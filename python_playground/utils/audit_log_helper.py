@@ -1,58 +1,463 @@
-from typing import Any, Dict, List, Union
+import atexit
+import logging
+import os
+import queue
+import socket
+import threading
+import time
+import weakref
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from requests import HTTPError, Session
+from requests import RequestException, Response, Session
+
+from python_playground.utils.audit_log_metrics import AuditLogMetrics, MetricsHook
+from python_playground.utils.audit_log_payload import (
+    content_headers,
+    get_serializer,
+    iter_payload,
+    validate_payload_options,
+)
+from python_playground.utils.audit_log_record import AuditLogRecord
+from python_playground.utils.audit_log_retry import (
+    AuditLogApiError,
+    handle_bulk_response,
+    handle_request_error,
+)
+from python_playground.utils.audit_log_spool import AuditLogSpool
+
+logger = logging.getLogger(__name__)
+
+# Sentinel pushed onto the background queue to stop the flusher thread.
+_STOP = object()
+
+# Live loggers, reset in the child process after `fork()` (see `AuditLogger._after_fork`).
+_instances: "weakref.WeakSet[AuditLogger]" = weakref.WeakSet()
 
 
 class AuditLogger:
 
-    def __init__(self, api_url: str, api_key: Union[str]):
+    def __init__(
+        self,
+        api_url: str,
+        api_key: Union[str],
+        background: bool = False,
+        max_batch_events: int = 500,
+        max_batch_bytes: int = 1024 * 1024,
+        max_batch_age: float = 5.0,
+        max_queue_size: int = 10_000,
+        spool_dir: Optional[str] = None,
+        spool_fsync: str = "interval",
+        spool_segment_bytes: int = 4 * 1024 * 1024,
+        payload_format: str = "json",
+        compression: Optional[str] = None,
+        serializer: Optional[str] = None,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        timeout: float = 10.0,
+        aggregator_socket: Optional[str] = None,
+        metrics_hook: Optional[MetricsHook] = None,
+    ):
         self.api_url: str = api_url
         self.audit_log_entries: List[Any] = []
         self.session: Session = Session()
         self.session.headers.update({"x-api-key": f"{api_key}"} if api_key else {})
 
+        # Upload encoding: anything but plain uncompressed JSON is streamed in chunks.
+        validate_payload_options(payload_format, compression)
+        self.payload_format = payload_format
+        self.compression = compression
+        self._dumps = get_serializer(serializer)
+
+        # Retries with exponential backoff; `_max_request_events` is learned from 413 responses.
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        # Seconds per request, so a hung endpoint can't block the (background) sender forever.
+        self.timeout = timeout
+        self._max_request_events: Optional[int] = None
+
+        # Background flusher thresholds: a batch is sent as soon as one of them is reached.
+        self.background = background
+        self.max_batch_events = max_batch_events
+        self.max_batch_bytes = max_batch_bytes
+        self.max_batch_age = max_batch_age
+        self.metrics = AuditLogMetrics(metrics_hook)
+
+        # Optional durable spool: events are written to disk first and replayed from there.
+        self.spool: Optional[AuditLogSpool] = (
+            AuditLogSpool(spool_dir, segment_max_bytes=spool_segment_bytes, fsync=spool_fsync)
+            if spool_dir
+            else None
+        )
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue_size)
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+        # Set in a forked child until it logs its first event, see `_after_fork`.
+        self._forked = False
+        self._spool_dropped = False
+        self._fork_lock = threading.Lock()
+        if background:
+            self._start_background_flusher()
+
+        # Pre-fork servers: hand events to a local `AuditLogAggregator` instead of posting them.
+        self.aggregator_socket = aggregator_socket
+        self._aggregator: Optional[socket.socket] = None
+        _instances.add(self)
+
+    def __enter__(self) -> "AuditLogger":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def dropped_events(self) -> int:
+        return self.metrics.counter("events_dropped")
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of the logger's counters, histograms and current buffer depth."""
+        snapshot = self.metrics.snapshot()
+        snapshot["buffer_depth"] = len(self.audit_log_entries) + self._queue.qsize()
+        return snapshot
+
     @staticmethod
     def _build_audit_log_record(
         event_name: str, application_name: str, module: str, action: str, **kwargs: Any
-    ) -> Dict[str, Any]:
+    ) -> AuditLogRecord:
         """Helper method to create a standard audit log record."""
-        audit_log = {
-            "event_name": event_name,
-            "application_name": application_name,
-            "module": module,
-            "action": action,
-        }
-        audit_log.update(kwargs)
-        return audit_log
+        return AuditLogRecord(event_name, application_name, module, action, kwargs)
 
     def log_and_send_event(
         self, event_name: str, application_name: str, module: str, action: str, **kwargs: Any
     ) -> Any:
         """Adds an event to the collection and optionally sends it immediately."""
-        self.audit_log_entries.append(
-            self._build_audit_log_record(event_name, application_name, module, action, **kwargs)
-        )
+        self.log_event(event_name, application_name, module, action, **kwargs)
         return self.send_batch()
 
     def log_event(
         self, event_name: str, application_name: str, module: str, action: str, **kwargs: Any
     ) -> None:
+        """Adds an event to the collection (non-blocking enqueue in background mode)."""
+        if self._forked:
+            self._resume_after_fork()
         entry = self._build_audit_log_record(event_name, application_name, module, action, **kwargs)
-        self.audit_log_entries.append(entry)
+        self.metrics.increment("events_enqueued")
+        if self.aggregator_socket and self._send_to_aggregator(entry):
+            return
+        if not self.background:
+            if self.spool is not None:
+                self.spool.append(entry)
+            else:
+                self.audit_log_entries.append(entry)
+            return
+        if self._closed:
+            raise RuntimeError("AuditLogger has been closed.")
+        if self.spool is not None:
+            # Written here, not by the flusher: while it waits for a slow backend, the queue
+            # fills up, but the events are already safe on disk.
+            size = self.spool.append(entry)
+            try:
+                # Only its size, which counts towards the batch thresholds.
+                self._queue.put_nowait(size)
+            except queue.Full:
+                pass
+            return
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            # Never block the caller: drop the event and keep count of it instead.
+            self.metrics.increment("events_dropped")
 
     def send_batch(self) -> Any:
         """Sends collected audit logs and clears the internal collection."""
+        if self.background:
+            self.flush()
+            return None
+        if self.spool is not None:
+            return self._replay_spool()
         if self.audit_log_entries:
-            response = self.session.post(f"{self.api_url}/create-bulk", json=self.audit_log_entries)
+            entries, self.audit_log_entries = self.audit_log_entries, []
             try:
-                response.raise_for_status()
-                # Reset the internal collection.
-                self.audit_log_entries = []
-                return response.json()
-            except HTTPError as e:
-                raise Exception(
-                    f"API request failed with status {response.status_code}: {response.text}. Error: {str(e)}"  # noqa: E501
+                return self._post_batch(entries)
+            except AuditLogApiError as e:
+                # Only keep the events the server didn't accept and that are worth a retry.
+                if e.retryable:
+                    self.audit_log_entries[:0] = e.failed_entries
+                else:
+                    self.metrics.increment("events_dropped", len(e.failed_entries))
+                raise
+            except Exception:
+                self.audit_log_entries[:0] = entries
+                raise
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Sends all events queued so far and waits for the background flusher to finish."""
+        if not self.background or self._worker is None or not self._worker.is_alive():
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Flushes the remaining events and stops the background flusher."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._worker is not None:
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                # Still release the spool and the session, the daemon flusher won't block the exit.
+                logger.warning(
+                    "Audit log queue still full after %ss, closing with %d events unsent",
+                    timeout,
+                    self._queue.qsize(),
                 )
+            else:
+                self._worker.join(timeout)
+        if self.spool is not None:
+            self.spool.close()
+        if self._aggregator is not None:
+            self._aggregator.close()
+        self.session.close()
+
+    def _send_to_aggregator(self, entry: AuditLogRecord) -> bool:
+        """Send an event to the aggregator, False if it isn't reachable or is overloaded."""
+        assert self.aggregator_socket is not None
+        try:
+            if self._aggregator is None:
+                self._aggregator = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+                self._aggregator.setblocking(False)
+                self._aggregator.connect(self.aggregator_socket)
+            self._aggregator.send(self._dumps(entry))
+            return True
+        except OSError:
+            # Fall back to handling the event locally.
+            if self._aggregator is not None:
+                self._aggregator.close()
+                self._aggregator = None
+            return False
+
+    def _after_fork(self) -> None:
+        """Drop everything inherited from the parent process: session, buffers and threads.
+
+        The flusher thread is only started again once the child logs an event, loggers it
+        never uses (e.g. the `AuditLogAggregator`'s, inherited from the master) stay idle.
+        """
+        headers = self.session.headers
+        self.session = Session()
+        self.session.headers.update(headers)
+        # The parent sends the events it buffered, the child starts empty.
+        self.audit_log_entries = []
+        self._queue = queue.Queue(maxsize=self._queue.maxsize)
+        self._aggregator = None
+        self.metrics = AuditLogMetrics(self.metrics.hook)
+        # The segment files belong to the parent.
+        self._spool_dropped = self.spool is not None
+        self.spool = None
+        self._fork_lock = threading.Lock()
+        self._forked = True
+
+    def _resume_after_fork(self) -> None:
+        with self._fork_lock:
+            if not self._forked:
+                return
+            if self._spool_dropped:
+                logger.warning(
+                    "A spool can't be shared across fork(), create the AuditLogger in the child "
+                    "process to use one. The child process sends events without a spool."
+                )
+            if self._worker is not None and not self._closed:
+                self._start_background_flusher()
+            self._forked = False
+
+    def _post_batch(self, entries: List[Any]) -> Any:
+        """Send a batch with retries, splitting it when it's too large for the server.
+
+        Raises `AuditLogApiError` with the events that were not accepted.
+        """
+        limit = self._max_request_events
+        if limit and len(entries) > limit:
+            response = None
+            for start in range(0, len(entries), limit):
+                end = start + limit
+                try:
+                    response = self._post_batch(entries[start:end])
+                except AuditLogApiError as e:
+                    e.failed_entries.extend(entries[end:])
+                    raise
+            return response
+
+        pending = entries
+        attempt = 0
+        while True:
+            try:
+                response = self._post_once(pending)
+            except RequestException as e:
+                outcome = handle_request_error(
+                    pending, e, attempt, self.metrics, *self._retry_options()
+                )
+            else:
+                outcome = handle_bulk_response(
+                    pending,
+                    response.status_code,
+                    response.headers,
+                    response.content,
+                    attempt,
+                    self.metrics,
+                    *self._retry_options(),
+                )
+            if outcome.too_large:
+                # Remember the smaller size for the following batches as well.
+                self._max_request_events = len(pending) // 2
+                return self._post_batch(pending)
+            if outcome.error is None:
+                return outcome.body
+            if outcome.retry_delay is None:
+                raise outcome.error
+            time.sleep(outcome.retry_delay)
+            pending = outcome.retryable
+            attempt += 1
+
+    def _retry_options(self) -> Tuple[int, float, float]:
+        return self.max_retries, self.backoff_base, self.backoff_max
+
+    def _post_once(self, entries: List[Any]) -> Response:
+        """Run a bulk request against the `POST /create-bulk` API endpoint."""
+        self.metrics.increment("requests")
+        self.metrics.observe("batch_size", len(entries))
+        data: Any
+        if self.payload_format == "json" and self.compression is None:
+            # Records are only turned into JSON here, at flush time.
+            with self.metrics.timed("serialization_seconds"):
+                data = self._dumps(entries)
+        else:
+            data = self.metrics.timed_chunks(
+                "serialization_seconds",
+                iter_payload(
+                    entries, self.payload_format, self.compression, serializer=self._dumps
+                ),
+            )
+        with self.metrics.timed("post_latency_seconds"):
+            return self.session.post(
+                f"{self.api_url}/create-bulk",
+                data=data,
+                headers=content_headers(self.payload_format, self.compression),
+                timeout=self.timeout,
+            )
+
+    def _replay_spool(self) -> Any:
+        """Send the spooled segments in order, dropping each one once it was acknowledged."""
+        assert self.spool is not None
+        response = None
+        self.spool.rotate()
+        for segment in self.spool.sealed_segments():
+            entries = self.spool.read_segment(segment)
+            if entries:
+                # Stops at the first failure, the segment stays on disk for the next attempt.
+                try:
+                    response = self._post_batch(entries)
+                except AuditLogApiError as e:
+                    failed = e.failed_entries if e.retryable else []
+                    if len(failed) < len(entries):
+                        # Part of the segment was accepted, only keep the rest on disk.
+                        for entry in failed:
+                            self.spool.append(entry)
+                        self.spool.ack(segment)
+                    raise
+            self.spool.ack(segment)
+        return response
+
+    def _start_background_flusher(self) -> None:
+        self._worker = threading.Thread(
+            target=self._run_background_flusher, name="audit-log-flusher", daemon=True
+        )
+        self._worker.start()
+
+    def _run_background_flusher(self) -> None:
+        """Collect queued events and send them once a count, size or age threshold is hit."""
+        batch: List[Any] = []
+        batch_events = 0
+        batch_bytes = 0
+        # Replay segments left over from a previous run right away.
+        deadline: Optional[float] = (
+            time.monotonic() if self.spool is not None and self.spool.has_pending() else None
+        )
+
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                # The oldest event in the batch reached `max_batch_age`.
+                item = None
+
+            if isinstance(item, (AuditLogRecord, int)):
+                if isinstance(item, int):
+                    # The size of an event `log_event` appended to the spool.
+                    batch_bytes += item
+                else:
+                    batch.append(item)
+                    batch_bytes += len(self._dumps(item))
+                batch_events += 1
+                if deadline is None:
+                    deadline = time.monotonic() + self.max_batch_age
+                if batch_events < self.max_batch_events and batch_bytes < self.max_batch_bytes:
+                    continue
+
+            if batch_events or deadline is not None:
+                deadline = self._send_background_batch(batch, batch_events)
+                batch, batch_events, batch_bytes = [], 0, 0
+
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is _STOP:
+                return
+
+    def _send_background_batch(self, batch: List[Any], batch_events: int) -> Optional[float]:
+        """Send a batch from the flusher thread and return the deadline for the next attempt."""
+        try:
+            if self.spool is not None:
+                self._replay_spool()
+            else:
+                self._post_batch(batch)
+        except Exception as e:
+            logger.exception("Failed to send %d audit log events", batch_events)
+            if self.spool is None and isinstance(e, AuditLogApiError) and e.retryable:
+                self._requeue(e.failed_entries)
+            elif self.spool is not None:
+                # The events are safe on disk, try again once `max_batch_age` has passed.
+                return time.monotonic() + self.max_batch_age
+        return None
+
+    def _requeue(self, entries: List[Any]) -> None:
+        """Put events that failed to send back onto the background queue."""
+        for entry in entries:
+            try:
+                self._queue.put_nowait(entry)
+            except queue.Full:
+                self.metrics.increment("events_dropped")
+
+
+def _reset_after_fork() -> None:
+    for instance in list(_instances):
+        instance._after_fork()
+
+
+@atexit.register
+def _close_at_exit() -> None:
+    """Don't lose queued events when the interpreter shuts down."""
+    for instance in list(_instances):
+        if instance._worker is not None:
+            instance.close()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
 
 
 def main() -> None:
@@ -0,0 +1,142 @@
+import bisect
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence
+
+# Called with (metric name, value) for every counter increment and histogram observation.
+MetricsHook = Callable[[str, float], None]
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1, 10, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Counters reported by the audit loggers, always present in a snapshot.
+COUNTERS = (
+    "events_enqueued",
+    "events_sent",
+    "events_dropped",
+    "batches_sent",
+    "requests",
+    "request_errors",
+    "retries",
+)
+
+
+class Histogram:
+    """Fixed bucket histogram, buckets are upper bounds (the last one catches the rest)."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.buckets[index] if index < len(self.buckets) else self.max
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "buckets": dict(zip([*map(str, self.buckets), "+Inf"], self.counts)),
+        }
+
+
+class AuditLogMetrics:
+    """Thread-safe counters and histograms of an audit logger."""
+
+    histogram_buckets: Dict[str, Sequence[float]] = {
+        "batch_size": SIZE_BUCKETS,
+        "serialization_seconds": LATENCY_BUCKETS,
+        "post_latency_seconds": LATENCY_BUCKETS,
+    }
+
+    def __init__(self, hook: Optional[MetricsHook] = None):
+        self.hook = hook
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        self._histograms = {
+            name: Histogram(buckets) for name, buckets in self.histogram_buckets.items()
+        }
+
+    def increment(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+        self._emit(name, value)
+
+    def observe(self, name: str, value: float) -> None:
+        with self._lock:
+            self._histograms[name].observe(value)
+        self._emit(name, value)
+
+    def counter(self, name: str) -> int:
+        return self._counters.get(name, 0)
+
+    def timed(self, name: str) -> "_Timer":
+        """Context manager observing the elapsed seconds in histogram `name`."""
+        return _Timer(self, name)
+
+    def timed_chunks(self, name: str, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        """Pass `chunks` through, observing the time spent producing them in `name`."""
+        elapsed = 0.0
+        while True:
+            start = time.perf_counter()
+            chunk = next(chunks, None)
+            elapsed += time.perf_counter() - start
+            if chunk is None:
+                break
+            yield chunk
+        self.observe(name, elapsed)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "histograms": {
+                    name: histogram.snapshot() for name, histogram in self._histograms.items()
+                },
+            }
+
+    def _emit(self, name: str, value: float) -> None:
+        if self.hook is not None:
+            try:
+                self.hook(name, value)
+            except Exception:
+                # A broken metrics backend must never break audit logging.
+                pass
+
+
+class _Timer:
+    def __init__(self, metrics: AuditLogMetrics, name: str):
+        self.metrics = metrics
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.metrics.observe(self.name, time.perf_counter() - self.start)
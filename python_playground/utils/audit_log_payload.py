@@ -0,0 +1,104 @@
+import importlib
+import json
+import zlib
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from python_playground.utils.audit_log_record import json_default
+
+
+def _optional_import(name: str) -> Any:
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+# Optional speedups, used when installed.
+orjson = _optional_import("orjson")
+zstandard = _optional_import("zstandard")
+
+# Available payload formats and content encodings for `POST /create-bulk` uploads.
+PAYLOAD_FORMATS = ("json", "ndjson")
+COMPRESSIONS = (None, "gzip", "zstd")
+CONTENT_TYPES = {"json": "application/json", "ndjson": "application/x-ndjson"}
+
+
+def get_serializer(name: Optional[str] = None) -> Callable[[Any], bytes]:
+    """Return a function that serializes one value to JSON bytes.
+
+    Uses orjson when it's installed, unless `name` explicitly asks for `json` (stdlib).
+    """
+    if name not in (None, "json", "orjson"):
+        raise ValueError(f"Invalid serializer: {name}")
+    if name == "orjson" and orjson is None:
+        raise ValueError("The orjson serializer requires the `orjson` package.")
+    if orjson is not None and name != "json":
+        return lambda value: orjson.dumps(value, default=json_default)
+    # Reuse one encoder instead of letting `json.dumps` build a new one per event.
+    encode = json.JSONEncoder(default=json_default, separators=(",", ":")).encode
+    return lambda value: encode(value).encode()
+
+
+def validate_payload_options(payload_format: str, compression: Optional[str]) -> None:
+    if payload_format not in PAYLOAD_FORMATS:
+        raise ValueError(f"Invalid payload format: {payload_format} (expected {PAYLOAD_FORMATS})")
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Invalid compression: {compression} (expected {COMPRESSIONS})")
+    if compression == "zstd" and zstandard is None:
+        raise ValueError("zstd compression requires the `zstandard` package.")
+
+
+def content_headers(payload_format: str, compression: Optional[str]) -> Dict[str, str]:
+    headers = {"Content-Type": CONTENT_TYPES[payload_format]}
+    if compression:
+        headers["Content-Encoding"] = compression
+    return headers
+
+
+def iter_payload(
+    entries: Iterable[Any],
+    payload_format: str = "ndjson",
+    compression: Optional[str] = None,
+    chunk_size: int = 64 * 1024,
+    serializer: Optional[Callable[[Any], bytes]] = None,
+) -> Iterator[bytes]:
+    """Serialize `entries` into (compressed) chunks of roughly `chunk_size` bytes.
+
+    Only one chunk is held in memory at a time, so the result can be passed straight
+    to a streaming (chunked transfer encoding) request body.
+    """
+    validate_payload_options(payload_format, compression)
+    dumps = serializer or get_serializer()
+
+    compressor: Any = None
+    if compression == "gzip":
+        compressor = zlib.compressobj(wbits=31)
+    elif compression == "zstd":
+        compressor = zstandard.ZstdCompressor().compressobj()
+
+    def encode(raw: bytes) -> bytes:
+        return compressor.compress(raw) if compressor is not None else raw
+
+    buffer = bytearray(b"[" if payload_format == "json" else b"")
+    first = True
+    for entry in entries:
+        if payload_format == "json":
+            if not first:
+                buffer += b","
+            buffer += dumps(entry)
+        else:
+            buffer += dumps(entry) + b"\n"
+        first = False
+        if len(buffer) >= chunk_size:
+            chunk = encode(bytes(buffer))
+            buffer.clear()
+            if chunk:
+                yield chunk
+
+    if payload_format == "json":
+        buffer += b"]"
+    chunk = encode(bytes(buffer))
+    if compressor is not None:
+        chunk += compressor.flush()
+    if chunk:
+        yield chunk
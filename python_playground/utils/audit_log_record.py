@@ -0,0 +1,53 @@
+import sys
+from typing import Any, Dict, Optional
+
+
+class AuditLogRecord:
+    """Compact audit log event, only turned into a dict/JSON when a batch is sent.
+
+    `__slots__` avoids a per-instance `__dict__` and the four common fields are interned,
+    so millions of events share a handful of `event_name`, `module`, ... strings.
+    """
+
+    __slots__ = ("event_name", "application_name", "module", "action", "extra")
+
+    def __init__(
+        self,
+        event_name: str,
+        application_name: str,
+        module: str,
+        action: str,
+        extra: Optional[Dict[str, Any]] = None,
+    ):
+        self.event_name = sys.intern(event_name)
+        self.application_name = sys.intern(application_name)
+        self.module = sys.intern(module)
+        self.action = sys.intern(action)
+        # Most events don't carry extra fields, don't allocate an empty dict for them.
+        self.extra = extra or None
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, AuditLogRecord):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"AuditLogRecord({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        audit_log = {
+            "event_name": self.event_name,
+            "application_name": self.application_name,
+            "module": self.module,
+            "action": self.action,
+        }
+        if self.extra:
+            audit_log.update(self.extra)
+        return audit_log
+
+
+def json_default(value: Any) -> Any:
+    """`default` hook for JSON serializers: records become dicts, anything else a string."""
+    if isinstance(value, AuditLogRecord):
+        return value.to_dict()
+    return str(value)
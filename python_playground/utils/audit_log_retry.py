@@ -0,0 +1,173 @@
+import json
+import logging
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+from python_playground.utils.audit_log_metrics import AuditLogMetrics
+
+logger = logging.getLogger(__name__)
+
+# Status codes that are worth another attempt: rate limited or server side trouble.
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+# The server refused the request body as too large, the batch gets split in halves.
+PAYLOAD_TOO_LARGE = 413
+
+
+class AuditLogApiError(Exception):
+    """A bulk request failed, `failed_entries` holds the events that were not accepted."""
+
+    def __init__(
+        self,
+        message: str,
+        status_code: Optional[int] = None,
+        failed_entries: Optional[List[Any]] = None,
+        retryable: bool = True,
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.failed_entries: List[Any] = failed_entries or []
+        self.retryable = retryable
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a `Retry-After` header, given either in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(
+    attempt: int, base: float, maximum: float, retry_after: Optional[float] = None
+) -> float:
+    """Exponential backoff with full jitter, never shorter than the server's `Retry-After`."""
+    delay = random.uniform(0, min(maximum, base * 2**attempt))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+def split_failed_items(entries: List[Any], body: Any) -> Tuple[List[Any], List[Any]]:
+    """Find the events a bulk response reported as failed.
+
+    Understands Elasticsearch style bulk responses: `{"errors": true, "items": [...]}` with
+    one item per event, in order, either `{"status": ...}` or `{"<op>": {"status": ...}}`.
+    Returns the failed events split into (retryable, rejected).
+    """
+    if not isinstance(body, dict) or not body.get("errors"):
+        return [], []
+    items = body.get("items")
+    if not isinstance(items, list) or len(items) != len(entries):
+        return [], []
+
+    retryable, rejected = [], []
+    for entry, item in zip(entries, items):
+        if isinstance(item, dict) and "status" not in item and len(item) == 1:
+            item = next(iter(item.values()))
+        status = item.get("status", 200) if isinstance(item, dict) else 200
+        if status in RETRY_STATUS_CODES:
+            retryable.append(entry)
+        elif status >= 300:
+            rejected.append(entry)
+    return retryable, rejected
+
+
+class BulkOutcome(NamedTuple):
+    """What to do after a bulk request, shared by the sync and the async logger.
+
+    `error` is `None` once every event was either accepted or rejected for good, `body` is the
+    response then. Otherwise the `retryable` events are sent again after `retry_delay` seconds,
+    or `error` is raised if `retry_delay` is `None`. `too_large` asks for the events to be sent
+    in smaller requests instead.
+    """
+
+    body: Any = None
+    accepted: int = 0
+    retryable: List[Any] = []
+    rejected: List[Any] = []
+    error: Optional[AuditLogApiError] = None
+    retry_delay: Optional[float] = None
+    too_large: bool = False
+
+
+def handle_bulk_response(
+    entries: List[Any],
+    status_code: int,
+    headers: Mapping[str, str],
+    body: Union[bytes, str],
+    attempt: int,
+    metrics: AuditLogMetrics,
+    max_retries: int,
+    backoff_base: float,
+    backoff_max: float,
+) -> BulkOutcome:
+    """Interpret the response to the bulk request of `entries` (the `attempt`-th retry)."""
+    text = body.decode("utf-8", "replace") if isinstance(body, bytes) else body
+    if status_code == PAYLOAD_TOO_LARGE and len(entries) > 1:
+        return BulkOutcome(retryable=entries, too_large=True)
+    if not 200 <= status_code < 300:
+        error = AuditLogApiError(
+            f"API request failed with status {status_code}: {text}",
+            status_code=status_code,
+            failed_entries=entries,
+            retryable=status_code in RETRY_STATUS_CODES,
+        )
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+        return _retry(error, attempt, metrics, max_retries, backoff_base, backoff_max, retry_after)
+
+    response_body = json.loads(body)
+    retryable, rejected = split_failed_items(entries, response_body)
+    if rejected:
+        metrics.increment("events_dropped", len(rejected))
+        logger.warning("Audit log API rejected %d events", len(rejected))
+    accepted = len(entries) - len(retryable) - len(rejected)
+    metrics.increment("events_sent", accepted)
+    if not retryable:
+        metrics.increment("batches_sent")
+        return BulkOutcome(response_body, accepted, [], rejected)
+    error = AuditLogApiError(
+        f"API request failed for {len(retryable)} events: {text}",
+        status_code=status_code,
+        failed_entries=retryable,
+    )
+    outcome = _retry(error, attempt, metrics, max_retries, backoff_base, backoff_max)
+    return outcome._replace(body=response_body, accepted=accepted, rejected=rejected)
+
+
+def handle_request_error(
+    entries: List[Any],
+    exception: Exception,
+    attempt: int,
+    metrics: AuditLogMetrics,
+    max_retries: int,
+    backoff_base: float,
+    backoff_max: float,
+) -> BulkOutcome:
+    """Like `handle_bulk_response()`, for a request that failed without a response."""
+    error = AuditLogApiError(f"API request failed: {str(exception)}", failed_entries=entries)
+    return _retry(error, attempt, metrics, max_retries, backoff_base, backoff_max)
+
+
+def _retry(
+    error: AuditLogApiError,
+    attempt: int,
+    metrics: AuditLogMetrics,
+    max_retries: int,
+    backoff_base: float,
+    backoff_max: float,
+    retry_after: Optional[float] = None,
+) -> BulkOutcome:
+    metrics.increment("request_errors")
+    if not error.retryable or attempt >= max_retries:
+        return BulkOutcome(retryable=error.failed_entries, error=error)
+    metrics.increment("retries")
+    delay = backoff_delay(attempt, backoff_base, backoff_max, retry_after)
+    return BulkOutcome(retryable=error.failed_entries, error=error, retry_delay=delay)
@@ -0,0 +1,137 @@
+import json
+import os
+import threading
+import time
+from typing import IO, Any, List, Optional
+
+from python_playground.utils.audit_log_record import json_default
+
+# Supported fsync policies: after every append, at most once per interval, or never (OS decides).
+FSYNC_POLICIES = ("always", "interval", "never")
+
+
+class AuditLogSpool:
+    """Append-only on-disk spool of audit log events, split into segment files.
+
+    Events are appended as JSON lines to the active segment. `rotate()` seals the active
+    segment so it can be replayed, and `ack()` removes a sealed segment once the server
+    acknowledged its events. Segments left over from a previous run are picked up on start.
+    """
+
+    segment_suffix = ".seg"
+
+    def __init__(
+        self,
+        directory: str,
+        segment_max_bytes: int = 4 * 1024 * 1024,
+        fsync: str = "interval",
+        fsync_interval: float = 1.0,
+    ):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Invalid fsync policy: {fsync} (expected one of {FSYNC_POLICIES})")
+        self.directory = directory
+        self.segment_max_bytes = segment_max_bytes
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self._lock = threading.Lock()
+        self._active: Optional[IO[bytes]] = None
+        self._active_path: Optional[str] = None
+        self._active_bytes = 0
+        self._last_fsync = time.monotonic()
+
+        os.makedirs(directory, exist_ok=True)
+        existing = self._segment_paths()
+        # Never append to a leftover segment: it may end with a torn line from a crash.
+        self._next_seq = self._segment_seq(existing[-1]) + 1 if existing else 0
+
+    def append(self, entry: Any) -> int:
+        """Append a single event and return the number of bytes written."""
+        line = json.dumps(entry, default=json_default).encode() + b"\n"
+        with self._lock:
+            if self._active is None or self._active_bytes >= self.segment_max_bytes:
+                self._open_segment()
+            assert self._active is not None
+            self._active.write(line)
+            self._active_bytes += len(line)
+            self._sync(force=self.fsync == "always")
+        return len(line)
+
+    def rotate(self) -> None:
+        """Seal the active segment so that its events become available for replay."""
+        with self._lock:
+            self._close_segment()
+
+    def sealed_segments(self) -> List[str]:
+        """Sealed segment paths, oldest first."""
+        with self._lock:
+            return [path for path in self._segment_paths() if path != self._active_path]
+
+    def has_pending(self) -> bool:
+        with self._lock:
+            return self._active_bytes > 0 or any(
+                path != self._active_path for path in self._segment_paths()
+            )
+
+    @staticmethod
+    def read_segment(path: str) -> List[Any]:
+        """Read the events of a segment, skipping a torn trailing line."""
+        entries = []
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+        return entries
+
+    @staticmethod
+    def ack(path: str) -> None:
+        """Drop a segment after its events were acknowledged by the server."""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_segment()
+
+    def _open_segment(self) -> None:
+        self._close_segment()
+        self._active_path = os.path.join(
+            self.directory, f"{self._next_seq:012d}{self.segment_suffix}"
+        )
+        self._next_seq += 1
+        self._active = open(self._active_path, "ab")
+        self._active_bytes = 0
+
+    def _close_segment(self) -> None:
+        if self._active is None:
+            return
+        self._sync(force=self.fsync != "never")
+        self._active.close()
+        if self._active_bytes == 0 and self._active_path:
+            os.remove(self._active_path)
+        self._active = None
+        self._active_path = None
+        self._active_bytes = 0
+
+    def _sync(self, force: bool = False) -> None:
+        assert self._active is not None
+        self._active.flush()
+        now = time.monotonic()
+        due = self.fsync == "interval" and now - self._last_fsync >= self.fsync_interval
+        if force or due:
+            os.fsync(self._active.fileno())
+            self._last_fsync = now
+
+    def _segment_paths(self) -> List[str]:
+        names = sorted(
+            name
+            for name in os.listdir(self.directory)
+            if name.endswith(self.segment_suffix) and name[: -len(self.segment_suffix)].isdigit()
+        )
+        return [os.path.join(self.directory, name) for name in names]
+
+    def _segment_seq(self, path: str) -> int:
+        return int(os.path.basename(path)[: -len(self.segment_suffix)])
@@ -0,0 +1,124 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, NamedTuple, Optional
+
+
+class CachedResponse(NamedTuple):
+    body: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+class ResponseCache:
+    """Persistent SQLite cache of GitHub API responses for conditional requests.
+
+    Entries are keyed by URL and token (hashed, the token itself is never stored). Entries
+    older than `ttl` seconds are evicted, and the least recently used ones once the cached
+    bodies exceed `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: Optional[float] = 7 * 24 * 3600,
+        max_bytes: Optional[int] = 64 * 1024 * 1024,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Shared by the worker threads of one client, access is serialized by `_lock`.
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    body TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    stored_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+            )
+
+    @staticmethod
+    def key(url: str, token: Optional[str]) -> str:
+        return hashlib.sha256(f"{token or ''}\n{url}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT body, etag, last_modified, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or (self.ttl is not None and row[3] < time.time() - self.ttl):
+            return None
+        return CachedResponse(row[0], row[1], row[2])
+
+    @staticmethod
+    def conditional_headers(cached: Optional[CachedResponse]) -> Dict[str, str]:
+        """Request headers asking the server to only send the body if it changed."""
+        headers = {}
+        if cached is not None and cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached is not None and cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+        return headers
+
+    def touch(self, key: str) -> None:
+        """Mark an entry as used, after the server confirmed it with `304 Not Modified`."""
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?",
+                (now, now, key),
+            )
+
+    def put(self, key: str, body: str, etag: Optional[str], last_modified: Optional[str]) -> None:
+        if not etag and not last_modified:
+            # Can't be revalidated, no point in caching it.
+            return
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, etag, last_modified, body, len(body), now, now),
+            )
+            self._evict(now)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _evict(self, now: float) -> None:
+        if self.ttl is not None:
+            self._connection.execute("DELETE FROM responses WHERE stored_at < ?", (now - self.ttl,))
+        if self.max_bytes is None:
+            return
+        (total,) = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        # Drop the least recently used entries until the cache fits again.
+        excess = total - self.max_bytes
+        rows = self._connection.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ).fetchall()
+        stale = []
+        for key, size in rows:
+            if excess <= 0:
+                break
+            stale.append((key,))
+            excess -= size
+        self._connection.executemany("DELETE FROM responses WHERE key = ?", stale)
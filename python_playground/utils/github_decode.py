@@ -0,0 +1,35 @@
+from typing import TYPE_CHECKING, Any, Dict, Type, TypeVar, Union, cast
+
+if TYPE_CHECKING:
+    from pydantic import TypeAdapter
+
+T = TypeVar("T")
+
+# Validators/serializers per type, `parse_obj_as()` rebuilds them on every call.
+_type_adapters: Dict[Any, "TypeAdapter[Any]"] = {}
+
+
+def type_adapter(data_type: Any) -> "TypeAdapter[Any]":
+    adapter = _type_adapters.get(data_type)
+    if adapter is None:
+        # Imported on first use, pydantic is the bulk of the start-up time.
+        from pydantic import TypeAdapter
+
+        adapter = _type_adapters.setdefault(data_type, TypeAdapter(data_type))
+    return adapter
+
+
+def decode(data_type: Type[T], body: Union[str, bytes]) -> T:
+    """Validate a JSON response body straight into `data_type` (a model or a `List[...]`).
+
+    Parsing and validating in one pass (in pydantic-core) costs little more than `json.loads()`,
+    building the models from plain dicts without validation (`model_construct()`) is slower.
+    """
+    return cast(T, type_adapter(data_type).validate_json(body))
+
+
+def dump(value: Any) -> Any:
+    """JSON compatible representation of a model or a list of models (URLs become strings)."""
+    if isinstance(value, list):
+        return [dump(item) for item in value]
+    return value.model_dump(mode="json")
@@ -0,0 +1,186 @@
+import json
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from python_playground.utils.github_decode import type_adapter
+from python_playground.utils.github_stats import GitHubApiClient
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+
+    from python_playground.models.github_stats import GitHubUserData, RepositoryData
+
+M = TypeVar("M", bound="BaseModel")
+
+# GitHub allows up to 100 aliases per query, but large queries cost more points and time out.
+DEFAULT_BATCH_SIZE = 50
+
+USER_FIELDS = """
+    __typename login databaseId id avatarUrl url isSiteAdmin name company websiteUrl location
+    email isHireable bio twitterUsername createdAt updatedAt
+    repositories(privacy: PUBLIC) { totalCount }
+    gists(privacy: PUBLIC) { totalCount }
+    followers { totalCount }
+    following { totalCount }
+"""
+
+REPOSITORY_FIELDS = """
+    nameWithOwner url description pushedAt stargazerCount forkCount
+    issues(states: OPEN) { totalCount }
+    pullRequests(states: OPEN) { totalCount }
+"""
+
+
+class GitHubGraphQLClient:
+    """Batches `get_*`-style lookups for many users/repositories into aliased GraphQL queries.
+
+    One query fetches up to `batch_size` items (`i0: repository(...) {...} i1: ...`), and the
+    results are mapped onto the REST models (`GitHubUserData`, `RepositoryData`). Requests go
+    through the session and the rate limiter of the given REST client, to `{base_url}/graphql`.
+    """
+
+    def __init__(self, client: GitHubApiClient, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.client = client
+        self.batch_size = max(1, batch_size)
+
+    def query(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run a GraphQL query and return its `data`, items that weren't found are `None` in it."""
+        response = self.client.send(
+            f"{self.client.base_url}/graphql",
+            "graphql",
+            payload={"query": query, "variables": variables or {}},
+        )
+        self.client.raise_for_status(response)
+        body = json.loads(response.content)
+        errors = body.get("errors") or []
+        # Errors without a path (syntax, rate limits, ...) concern the whole query.
+        fatal = [error for error in errors if not error.get("path")]
+        if fatal or body.get("data") is None:
+            raise Exception(f"GraphQL query failed: {json.dumps(fatal or errors)}")
+        return dict(body["data"])
+
+    def get_users(self, logins: Iterable[str]) -> Dict[str, Optional["GitHubUserData"]]:
+        """Get the user information of many users, `None` for the ones that don't exist."""
+        from python_playground.models.github_stats import GitHubUserData
+
+        return self._batch(
+            GitHubUserData,
+            [(login, {"login": login}) for login in dict.fromkeys(logins)],
+            "user(login: {login})",
+            {"login": "String!"},
+            USER_FIELDS,
+            self._user_data,
+        )
+
+    def get_repositories(
+        self, repositories: Iterable[str]
+    ) -> Dict[str, Optional["RepositoryData"]]:
+        """Get the metadata of many `owner/repo` repositories, `None` for the ones not found."""
+        from python_playground.models.github_stats import RepositoryData
+
+        items = []
+        for repository in dict.fromkeys(repositories):
+            owner, _, name = repository.partition("/")
+            items.append((repository, {"owner": owner, "name": name}))
+        return self._batch(
+            RepositoryData,
+            items,
+            "repository(owner: {owner}, name: {name})",
+            {"owner": "String!", "name": "String!"},
+            REPOSITORY_FIELDS,
+            self._repository_data,
+        )
+
+    def _batch(
+        self,
+        model: Type[M],
+        items: List[Tuple[str, Dict[str, str]]],
+        field: str,
+        argument_types: Dict[str, str],
+        selection: str,
+        to_rest: Callable[[Dict[str, Any]], Dict[str, Any]],
+    ) -> Dict[str, Optional[M]]:
+        results: Dict[str, Optional[M]] = {}
+        adapter = type_adapter(model)
+        for start in range(0, len(items), self.batch_size):
+            end = start + self.batch_size
+            batch = items[start:end]
+            definitions = []
+            fields = []
+            variables = {}
+            for index, (_, arguments) in enumerate(batch, start):
+                # Aliases and variables are numbered, user input never ends up in the query.
+                names = {argument: f"{argument}{index}" for argument in arguments}
+                definitions += [f"${names[a]}: {argument_types[a]}" for a in arguments]
+                variables.update({names[a]: value for a, value in arguments.items()})
+                call = field.format(**{a: f"${names[a]}" for a in arguments})
+                fields.append(f"i{index}: {call} {{{selection}}}")
+            selections = "\n".join(fields)
+            data = self.query(f"query({', '.join(definitions)}) {{\n{selections}\n}}", variables)
+            for index, (key, _) in enumerate(batch, start):
+                node = data.get(f"i{index}")
+                results[key] = adapter.validate_python(to_rest(node)) if node else None
+        return results
+
+    def _user_data(self, node: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a GraphQL `User` onto the fields of `GET /users/{login}`."""
+        api_url = f"{self.client.base_url}/users/{node['login']}"
+        return {
+            "login": node["login"],
+            "id": node["databaseId"],
+            "node_id": node["id"],
+            "avatar_url": node["avatarUrl"],
+            "gravatar_id": "",
+            "url": api_url,
+            "html_url": node["url"],
+            "followers_url": f"{api_url}/followers",
+            "following_url": f"{api_url}/following{{/other_user}}",
+            "gists_url": f"{api_url}/gists{{/gist_id}}",
+            "starred_url": f"{api_url}/starred{{/owner}}{{/repo}}",
+            "subscriptions_url": f"{api_url}/subscriptions",
+            "organizations_url": f"{api_url}/orgs",
+            "repos_url": f"{api_url}/repos",
+            "events_url": f"{api_url}/events{{/privacy}}",
+            "received_events_url": f"{api_url}/received_events",
+            "type": node["__typename"],
+            "site_admin": node["isSiteAdmin"],
+            "name": node["name"],
+            "company": node["company"],
+            "blog": node["websiteUrl"],
+            "location": node["location"],
+            # GraphQL returns an empty string for private emails, REST returns null.
+            "email": node["email"] or None,
+            "hireable": node["isHireable"],
+            "bio": node["bio"],
+            "twitter_username": node["twitterUsername"],
+            "public_repos": node["repositories"]["totalCount"],
+            "public_gists": node["gists"]["totalCount"],
+            "followers": node["followers"]["totalCount"],
+            "following": node["following"]["totalCount"],
+            "created_at": node["createdAt"],
+            "updated_at": node["updatedAt"],
+        }
+
+    @staticmethod
+    def _repository_data(node: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a GraphQL `Repository` onto the fields of `GET /repos/{owner}/{repo}`."""
+        return {
+            "full_name": node["nameWithOwner"],
+            "html_url": node["url"],
+            "description": node["description"],
+            "stargazers_count": node["stargazerCount"],
+            "forks_count": node["forkCount"],
+            # REST counts open pull requests as issues as well.
+            "open_issues_count": node["issues"]["totalCount"] + node["pullRequests"]["totalCount"],
+            "pushed_at": node["pushedAt"],
+        }
@@ -0,0 +1,125 @@
+import threading
+import time
+from typing import Callable, Dict, Mapping, Optional
+
+from python_playground.models.github_stats import RateLimitItem, RateLimitResourceData
+
+# Without a `Retry-After` header, GitHub asks to wait at least a minute on secondary rate limits.
+SECONDARY_RATE_LIMIT_WAIT = 60.0
+
+
+class RateLimitScheduler:
+    """Paces GitHub API requests based on the rate limit headers of every response.
+
+    Budgets are tracked per resource (`core`, `search`, `graphql`, ...) as `RateLimitItem`s.
+    `acquire()` blocks while a resource has no budget left for another request (counting the
+    requests still in flight) until its window resets, and while a secondary rate limit
+    (`Retry-After`) is in effect for all resources.
+    """
+
+    def __init__(
+        self,
+        reserve: int = 0,
+        clock: Callable[[], float] = time.time,
+    ):
+        # Number of requests per resource to keep in reserve for other consumers of the token.
+        self.reserve = reserve
+        self.clock = clock
+        self.limits: Dict[str, RateLimitItem] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._blocked_until = 0.0
+        self._condition = threading.Condition()
+
+    @staticmethod
+    def resource_for(path: str) -> str:
+        """The rate limit resource a REST API path is counted against."""
+        if path.startswith("search/code"):
+            return "code_search"
+        if path.startswith("search/"):
+            return "search"
+        if path.startswith("graphql"):
+            return "graphql"
+        return "core"
+
+    def seed(self, resources: RateLimitResourceData) -> None:
+        """Initialize all budgets from a `GET /rate_limit` response."""
+        with self._condition:
+            for name in RateLimitResourceData.model_fields:
+                self.limits[name] = getattr(resources, name)
+            self._condition.notify_all()
+
+    def acquire(self, resource: str = "core") -> None:
+        """Wait until a request against `resource` can be made without hitting the limit."""
+        with self._condition:
+            while True:
+                wait = self._wait_time(resource)
+                if wait <= 0:
+                    self._in_flight[resource] = self._in_flight.get(resource, 0) + 1
+                    return
+                self._condition.wait(timeout=wait)
+
+    def release(self, resource: str = "core") -> None:
+        with self._condition:
+            self._in_flight[resource] = max(0, self._in_flight.get(resource, 0) - 1)
+            self._condition.notify_all()
+
+    def update(
+        self, status_code: int, headers: Mapping[str, str], message: str = ""
+    ) -> Optional[float]:
+        """Track the budget reported by a response (`message` is the response body).
+
+        Returns the number of seconds to wait before retrying when the request was rate limited.
+        """
+        now = self.clock()
+        with self._condition:
+            item = self._parse_headers(headers)
+            resource = headers.get("X-RateLimit-Resource", "core")
+            if item is not None:
+                current = self.limits.get(resource)
+                if current is not None and current.reset == item.reset:
+                    # Responses can arrive out of order, the lowest budget is the latest one.
+                    item.remaining = min(item.remaining, current.remaining)
+                self.limits[resource] = item
+
+            wait: Optional[float] = None
+            if status_code in (403, 429):
+                retry_after = headers.get("Retry-After")
+                if retry_after is not None and retry_after.isdigit():
+                    wait = float(retry_after)
+                elif item is not None and item.remaining == 0:
+                    # Primary rate limit: the budget of this resource is used up until the reset.
+                    wait = max(0.0, item.reset - now) + 1
+                elif status_code == 429 or "rate limit" in message.lower():
+                    wait = SECONDARY_RATE_LIMIT_WAIT
+            if wait is not None and (item is None or item.remaining > 0):
+                # Secondary rate limits apply to all resources.
+                self._blocked_until = max(self._blocked_until, now + wait)
+            self._condition.notify_all()
+            return wait
+
+    def _wait_time(self, resource: str) -> float:
+        now = self.clock()
+        if self._blocked_until > now:
+            return self._blocked_until - now
+        item = self.limits.get(resource)
+        if item is None or item.reset <= now:
+            # Unknown budget or a new window: the next response tells us more.
+            return 0.0
+        if item.remaining - self._in_flight.get(resource, 0) > self.reserve:
+            return 0.0
+        if self._in_flight.get(resource, 0):
+            # Requests in flight may still free up budget (e.g. if they fail), re-check then.
+            return min(1.0, item.reset - now)
+        return item.reset - now + 1
+
+    @staticmethod
+    def _parse_headers(headers: Mapping[str, str]) -> Optional[RateLimitItem]:
+        try:
+            return RateLimitItem(
+                limit=int(headers["X-RateLimit-Limit"]),
+                used=int(headers.get("X-RateLimit-Used", 0)),
+                remaining=int(headers["X-RateLimit-Remaining"]),
+                reset=int(headers["X-RateLimit-Reset"]),
+            )
+        except (KeyError, ValueError):
+            return None
@@ -1,19 +1,50 @@
 import argparse
+import copy
 import json
-from typing import Any, Dict, List, Tuple, Union
-
-from pydantic import parse_obj_as
-from requests import HTTPError, Response, Session
-
-from python_playground.models.github_stats import (
-    GitHubUserData,
-    RateLimitData,
-    TrafficClonesData,
-    TrafficPopularPathsData,
-    TrafficPopularReferrersData,
-    TrafficViewsData,
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
 )
 
+from python_playground.utils.github_decode import decode, dump
+
+# requests, pydantic and the models are imported when they're first needed, so importing the
+# client (or running `--help`) stays cheap for the short-lived collection jobs.
+if TYPE_CHECKING:
+    from requests import Response
+
+    from python_playground.models.github_stats import (
+        ForkData,
+        GitHubUserData,
+        RateLimitData,
+        ReleaseData,
+        RepositoryData,
+        SimpleUserData,
+        TrafficClonesData,
+        TrafficPopularPathsData,
+        TrafficPopularReferrersData,
+        TrafficViewsData,
+    )
+    from python_playground.utils.github_cache import ResponseCache
+    from python_playground.utils.github_traffic_history import TrafficHistoryStore
+
+T = TypeVar("T")
+
+# How often a rate limited request is retried after waiting for the limit to reset.
+RATE_LIMIT_RETRIES = 3
+
 # Available metrics data to fetch.
 valid_metrics_data = [
     "rate_limit",
@@ -24,36 +55,6 @@ valid_metrics_data = [
     "traffic_popular_paths",
 ]
 
-parser = argparse.ArgumentParser(description="GitHub Statistics Collector")
-parser.add_argument("-u", "--username", required=False, help="GitHub username", type=str)
-parser.add_argument("-r", "--repository", required=False, help="GitHub repository name", type=str)
-parser.add_argument("-t", "--token", required=False, help="GitHub API token", type=str)
-parser.add_argument(
-    "-m",
-    "--metrics",
-    required=False,
-    help="Comma-separated list of metrics data "
-    "to process: rate_limit, user_info, traffic_views, etc.",
-    type=str,
-)
-
-args = parser.parse_args()
-
-# If script arguments are missing, the script will prompt for them.
-input_username = args.username if args.username else input("Enter your GitHub username: ")
-input_repository = (
-    args.repository if args.repository else input("Enter your GitHub repository name: ")
-)
-input_token = args.token if args.token else input("Enter your GitHub API token: ")
-input_metrics = (
-    args.metrics
-    if args.metrics
-    else input(
-        "Provide a comma-separated list of metrics data "
-        "to process or leave it empty for all metrics data: "
-    )
-)
-
 
 class CustomJSONEncoder(json.JSONEncoder):
     """Custom JSON encoder to handle Pydantic models."""
@@ -69,55 +70,207 @@ class GitHubApiClient:
 
     process_metrics_items: List[str] = []
 
-    def __init__(self, username: str, repo: str, token: str, metrics: str):
+    def __init__(
+        self,
+        username: str,
+        repo: str,
+        token: str,
+        metrics: str,
+        concurrency: int = 6,
+        cache: Optional["ResponseCache"] = None,
+        history: Optional["TrafficHistoryStore"] = None,
+    ):
+        from requests import Session
+        from requests.adapters import HTTPAdapter
+
+        from python_playground.utils.github_rate_limit import RateLimitScheduler
+
         self.username = username
         self.repo = repo
         self.metrics = metrics
+        self.concurrency = max(1, concurrency)
         self.base_url = "https://api.github.com"
         self.session = Session()
         self.session.headers.update({"Authorization": f"token {token}"} if token else {})
+        # Keep one pooled connection per concurrent request.
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=self.concurrency))
+        # Shared by all clients created with `for_repository()`, as they use the same token.
+        self.rate_limiter = RateLimitScheduler()
+        self.cache = cache
+        self.history = history
         self.process_metrics_options()
 
-    def request(self, path: str, requires_repo: bool = True) -> Union[Any, Response]:
+    def request(self, path: str, requires_repo: bool = True) -> Union[Any, "Response"]:
         """Handle REST API requests."""
+        return json.loads(self.request_body(path, requires_repo))
+
+    def request_body(self, path: str, requires_repo: bool = True) -> Union[str, bytes]:
+        """Handle REST API requests, returning the raw JSON body."""
+        url = self.url_for(path, requires_repo)
+
+        # Conditional requests answered with `304 Not Modified` don't count against the rate limit.
+        cache_key = None
+        cached = None
+        if self.cache is not None:
+            cache_key = self.cache.key(url, str(self.session.headers.get("Authorization", "")))
+            cached = self.cache.get(cache_key)
+        headers = self.cache.conditional_headers(cached) if self.cache is not None else {}
+
+        response = self.send(url, self.rate_limiter.resource_for(path), headers)
+        if response.status_code == 304 and cached is not None and cache_key is not None:
+            assert self.cache is not None
+            self.cache.touch(cache_key)
+            return cached.body
+        self.raise_for_status(response)
+        if self.cache is not None and cache_key is not None:
+            self.cache.put(
+                cache_key,
+                response.text,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+            )
+        return response.content
+
+    def url_for(self, path: str, requires_repo: bool = True) -> str:
         if requires_repo and self.username and self.repo:
-            url = f"{self.base_url}/repos/{self.username}/{self.repo}/{path}"
-        else:
-            url = f"{self.base_url}/{path}"
+            repo_url = f"{self.base_url}/repos/{self.username}/{self.repo}"
+            return f"{repo_url}/{path}" if path else repo_url
+        return f"{self.base_url}/{path}"
+
+    def send(
+        self,
+        url: str,
+        resource: str = "core",
+        headers: Optional[Dict[str, str]] = None,
+        payload: Optional[Any] = None,
+    ) -> "Response":
+        """GET a URL (or POST a JSON `payload`), waiting for and retrying on rate limits."""
+        for _ in range(RATE_LIMIT_RETRIES + 1):
+            # Pauses while the resource's budget is used up or a secondary limit is in effect.
+            self.rate_limiter.acquire(resource)
+            try:
+                if payload is None:
+                    response = self.session.get(url, headers=headers)
+                else:
+                    response = self.session.post(url, headers=headers, json=payload)
+            finally:
+                self.rate_limiter.release(resource)
+            retry_after = self.rate_limiter.update(
+                response.status_code, response.headers, response.text if not response.ok else ""
+            )
+            if retry_after is None:
+                break
+        return response
+
+    @staticmethod
+    def raise_for_status(response: "Response") -> None:
+        from requests import HTTPError
 
-        response = self.session.get(url)
         try:
             response.raise_for_status()
         except HTTPError as e:
             raise Exception(
                 f"API request failed with status {response.status_code}: {response.text}. Error: {str(e)}"  # noqa: E501
             )
-        return response.json()
 
-    def get_user_info(self) -> GitHubUserData:
+    def paginate(
+        self,
+        data_type: Type[T],
+        path: str,
+        requires_repo: bool = True,
+        per_page: int = 100,
+        prefetch: bool = False,
+    ) -> Iterator[T]:
+        """Yield the items of a paginated collection, following the `rel="next"` links.
+
+        Only one page is held in memory at a time. With `prefetch`, the next page is already
+        requested while the items of the current one are consumed. Pages aren't cached, the
+        `Link` header isn't part of a cached response.
+        """
+        resource = self.rate_limiter.resource_for(path)
+        separator = "&" if "?" in path else "?"
+        url: Optional[str] = f"{self.url_for(path, requires_repo)}{separator}per_page={per_page}"
+        pool = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        next_page: Optional["Future[Response]"] = None
+        try:
+            while url is not None:
+                response = next_page.result() if next_page is not None else self.send(url, resource)
+                self.raise_for_status(response)
+                url = response.links.get("next", {}).get("url")
+                next_page = pool.submit(self.send, url, resource) if pool and url else None
+                yield from decode(List[data_type], response.content)  # type: ignore[valid-type]
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+    def iter_stargazers(self, prefetch: bool = False) -> Iterator["SimpleUserData"]:
+        """Stream the users who starred the repository."""
+        from python_playground.models.github_stats import SimpleUserData
+
+        return self.paginate(SimpleUserData, "stargazers", prefetch=prefetch)
+
+    def iter_forks(self, prefetch: bool = False) -> Iterator["ForkData"]:
+        """Stream the forks of the repository."""
+        from python_playground.models.github_stats import ForkData
+
+        return self.paginate(ForkData, "forks", prefetch=prefetch)
+
+    def iter_releases(self, prefetch: bool = False) -> Iterator["ReleaseData"]:
+        """Stream the releases of the repository, including the download counts of their assets."""
+        from python_playground.models.github_stats import ReleaseData
+
+        return self.paginate(ReleaseData, "releases", prefetch=prefetch)
+
+    def get_repository(self) -> "RepositoryData":
+        """Get the GitHub repository metadata: stars, forks, open issues, etc."""
+        from python_playground.models.github_stats import RepositoryData
+
+        return decode(RepositoryData, self.request_body(""))
+
+    def get_user_info(self) -> "GitHubUserData":
         """Get the GitHub user information."""
-        return parse_obj_as(GitHubUserData, self.request("user", False))
+        from python_playground.models.github_stats import GitHubUserData
 
-    def get_rate_limit(self) -> RateLimitData:
+        return decode(GitHubUserData, self.request_body("user", False))
+
+    def get_rate_limit(self) -> "RateLimitData":
         """Get the GitHub users rate limit for all resources."""
-        return parse_obj_as(RateLimitData, self.request("rate_limit", False))
+        from python_playground.models.github_stats import RateLimitData
+
+        rate_limit = decode(RateLimitData, self.request_body("rate_limit", False))
+        self.rate_limiter.seed(rate_limit.resources)
+        return rate_limit
 
-    def get_traffic_clones(self) -> TrafficClonesData:
+    def get_traffic_clones(self) -> "TrafficClonesData":
         """Get the GitHub branch traffic information: (Unique) Clones."""
-        return parse_obj_as(TrafficClonesData, self.request("traffic/clones"))
+        from python_playground.models.github_stats import TrafficClonesData
 
-    def get_traffic_views(self) -> TrafficViewsData:
+        clones = decode(TrafficClonesData, self.request_body("traffic/clones"))
+        if self.history is not None:
+            self.history.ingest(f"{self.username}/{self.repo}", "clones", clones.clones)
+        return clones
+
+    def get_traffic_views(self) -> "TrafficViewsData":
         """Get the GitHub branch traffic information: (Unique) Views."""
-        return parse_obj_as(TrafficViewsData, self.request("traffic/views"))
+        from python_playground.models.github_stats import TrafficViewsData
+
+        views = decode(TrafficViewsData, self.request_body("traffic/views"))
+        if self.history is not None:
+            self.history.ingest(f"{self.username}/{self.repo}", "views", views.views)
+        return views
 
-    def get_traffic_popular_paths(self) -> List[TrafficPopularPathsData]:
+    def get_traffic_popular_paths(self) -> List["TrafficPopularPathsData"]:
         """Get the GitHub branch traffic information: (Unique) Popular paths."""
-        return parse_obj_as(List[TrafficPopularPathsData], self.request("traffic/popular/paths"))
+        from python_playground.models.github_stats import TrafficPopularPathsData
 
-    def get_traffic_popular_referrers(self) -> List[TrafficPopularReferrersData]:
+        return decode(List[TrafficPopularPathsData], self.request_body("traffic/popular/paths"))
+
+    def get_traffic_popular_referrers(self) -> List["TrafficPopularReferrersData"]:
         """Get the GitHub branch traffic information: Popular referrers."""
-        return parse_obj_as(
-            List[TrafficPopularReferrersData], self.request("traffic/popular/referrers")
+        from python_playground.models.github_stats import TrafficPopularReferrersData
+
+        return decode(
+            List[TrafficPopularReferrersData], self.request_body("traffic/popular/referrers")
         )
 
     def process_metrics_options(self) -> None:
@@ -135,47 +288,235 @@ class GitHubApiClient:
         else:
             self.process_metrics_items = valid_metrics_data
 
+    def metrics_options(self) -> Dict[str, Callable[[], Any]]:
+        """Map each metrics data item to the method fetching it."""
+        return {
+            "traffic_clones": self.get_traffic_clones,
+            "traffic_views": self.get_traffic_views,
+            "rate_limit": self.get_rate_limit,
+            "user_info": self.get_user_info,
+            "traffic_popular_paths": self.get_traffic_popular_paths,
+            "traffic_popular_referrers": self.get_traffic_popular_referrers,
+        }
+
+    def fetch_metrics(self) -> Dict[str, Any]:
+        """Fetch all selected metrics data concurrently, keyed in the requested order."""
+        metrics_options = self.metrics_options()
+        data_items = [item for item in self.process_metrics_items if item in metrics_options]
+
+        # The requests are independent of each other, run them on a bounded worker pool.
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(data_items) or 1)) as pool:
+            futures = {item: pool.submit(metrics_options[item]) for item in data_items}
+
+        return self.build_stdout({item: futures[item].result() for item in data_items})
+
+    def for_repository(self, username: str, repo: str) -> "GitHubApiClient":
+        """A client for another repository, sharing this client's pooled session."""
+        client = copy.copy(self)
+        client.username = username
+        client.repo = repo
+        return client
+
+    def fetch_repositories(self, repositories: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """Fetch the traffic metrics of many `owner/repo` repositories concurrently.
+
+        Yields one record per repository as soon as all of its requests completed.
+        A failing repository yields a record with an `error` instead of stopping the batch.
+        """
+        data_items = [item for item in self.process_metrics_items if item.startswith("traffic_")]
+        futures: Dict["Future[Any]", Tuple[str, str]] = {}
+        results: Dict[str, Dict[str, Any]] = {}
+        errors: Dict[str, str] = {}
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for repository in repositories:
+                username, _, repo = repository.strip().partition("/")
+                if not username or not repo or "/" in repo:
+                    yield {"repository": repository, "error": "Expected an owner/repo pair."}
+                    continue
+                if repository in results:
+                    continue
+                results[repository] = {}
+                metrics_options = self.for_repository(username, repo).metrics_options()
+                for item in data_items:
+                    futures[pool.submit(metrics_options[item])] = (repository, item)
+
+            pending = {repository: len(data_items) for repository in results}
+            if not data_items:
+                # No traffic metrics selected, nothing to wait for.
+                yield from ({"repository": repository, "traffic": {}} for repository in results)
+            for future in as_completed(futures):
+                repository, item = futures[future]
+                try:
+                    results[repository][item] = future.result()
+                except Exception as e:
+                    errors.setdefault(repository, str(e))
+                pending[repository] -= 1
+                if pending[repository]:
+                    continue
+                if repository in errors:
+                    yield {"repository": repository, "error": errors.pop(repository)}
+                else:
+                    # Keep the requested metrics order within each record.
+                    data = {item: results[repository][item] for item in data_items}
+                    yield {"repository": repository, **self.build_stdout(data)}
+                del results[repository]
+
+    def build_stdout(self, responses: Dict[str, Any]) -> Dict[str, Any]:
+        """Transform the responses of each metrics data item into the output structure."""
+        stdout: Dict[str, Any] = {"traffic": {}}
+        for data_item, response in responses.items():
+            if "traffic" in data_item:
+                key = data_item.replace("traffic_", "")
+                stdout["traffic"][key] = self.transform_response(response)
+            else:
+                stdout[data_item] = self.transform_response(response)
+        return stdout
+
     @staticmethod
     def transform_response(data: Any) -> Union[Any, Tuple[Dict[Any, Any], ...]]:
-        if isinstance(data, List):
-            return [item.dict() for item in data]
-        else:
-            return data.dict()
+        # Straight to JSON compatible dicts, no `CustomJSONEncoder` round-trip for URLs.
+        return dump(data)
 
     @staticmethod
-    def json_stdout(stdout: Any) -> Any:
+    def json_stdout(stdout: Any, indent: Optional[int] = 2) -> Any:
         if "views" in stdout["traffic"]:
             stdout["traffic"]["views"]["data"] = stdout["traffic"]["views"].pop("views")
         if "clones" in stdout["traffic"]:
             stdout["traffic"]["clones"]["data"] = stdout["traffic"]["clones"].pop("clones")
-        return json.dumps(stdout, indent=2, cls=CustomJSONEncoder)
+        return json.dumps(stdout, indent=indent, cls=CustomJSONEncoder)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="GitHub Statistics Collector")
+    parser.add_argument("-u", "--username", required=False, help="GitHub username", type=str)
+    parser.add_argument(
+        "-r", "--repository", required=False, help="GitHub repository name", type=str
+    )
+    parser.add_argument("-t", "--token", required=False, help="GitHub API token", type=str)
+    parser.add_argument(
+        "-m",
+        "--metrics",
+        required=False,
+        help="Comma-separated list of metrics data "
+        "to process: rate_limit, user_info, traffic_views, etc.",
+        type=str,
+    )
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        required=False,
+        default=6,
+        help="Maximum number of concurrent GitHub API requests (default: 6)",
+        type=int,
+    )
+    parser.add_argument(
+        "--repos",
+        required=False,
+        help="Batch mode: comma-separated list of owner/repo pairs, printed as NDJSON",
+        type=str,
+    )
+    parser.add_argument(
+        "--repos-file",
+        required=False,
+        help="Batch mode: file with one owner/repo pair per line ('-' reads from stdin)",
+        type=str,
+    )
+    parser.add_argument(
+        "--cache",
+        required=False,
+        help="SQLite file caching responses for conditional (ETag) requests",
+        type=str,
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        required=False,
+        default=7 * 24 * 3600,
+        help="Evict cached responses after this many seconds (default: 7 days)",
+        type=float,
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        required=False,
+        default=64,
+        help="Maximum size of the cached responses in MB (default: 64)",
+        type=float,
+    )
+    parser.add_argument(
+        "--history",
+        required=False,
+        help="SQLite file keeping the fetched traffic views/clones beyond GitHub's 14 days",
+        type=str,
+    )
+    return parser.parse_args(argv)
+
+
+def read_repositories(repos: Optional[str], repos_file: Optional[str]) -> Iterator[str]:
+    """Yield the owner/repo pairs given on the command line and/or in a file."""
+    if repos:
+        yield from (repo.strip() for repo in repos.split(",") if repo.strip())
+    if repos_file:
+        with sys.stdin if repos_file == "-" else open(repos_file, "r") as f:
+            for line in f:
+                line = line.split("#", 1)[0].strip()
+                if line:
+                    yield line
 
 
 def main() -> None:
-    client = GitHubApiClient(input_username, input_repository, input_token, input_metrics)
-
-    metrics_options = {
-        "traffic_clones": client.get_traffic_clones,
-        "traffic_views": client.get_traffic_views,
-        "rate_limit": client.get_rate_limit,
-        "user_info": client.get_user_info,
-        "traffic_popular_paths": client.get_traffic_popular_paths,
-        "traffic_popular_referrers": client.get_traffic_popular_referrers,
-    }
-
-    stdout: Dict[str, Any] = {"traffic": {}}
-
-    for data_item in client.process_metrics_items:
-        if data_item in metrics_options:
-            # Run the REST API requests and transform the response.
-            response = metrics_options[data_item]()
-            if "traffic" in data_item:
-                key = data_item.replace("traffic_", "")
-                stdout["traffic"][key] = client.transform_response(response)
-            else:
-                stdout[data_item] = client.transform_response(response)
+    args = parse_args()
+    batch_mode = bool(args.repos or args.repos_file)
+
+    # If script arguments are missing, the script will prompt for them.
+    input_username = (
+        args.username if args.username or batch_mode else input("Enter your GitHub username: ")
+    )
+    input_repository = (
+        args.repository
+        if args.repository or batch_mode
+        else input("Enter your GitHub repository name: ")
+    )
+    input_token = args.token if args.token else input("Enter your GitHub API token: ")
+    input_metrics = (
+        args.metrics
+        if args.metrics
+        else input(
+            "Provide a comma-separated list of metrics data "
+            "to process or leave it empty for all metrics data: "
+        )
+    )
 
-    print(client.json_stdout(stdout))
+    cache = None
+    if args.cache:
+        from python_playground.utils.github_cache import ResponseCache
+
+        cache = ResponseCache(
+            args.cache, ttl=args.cache_ttl, max_bytes=int(args.cache_max_mb * 1024**2)
+        )
+    history = None
+    if args.history:
+        from python_playground.utils.github_traffic_history import TrafficHistoryStore
+
+        history = TrafficHistoryStore(args.history)
+    client = GitHubApiClient(
+        input_username,
+        input_repository,
+        input_token,
+        input_metrics,
+        args.concurrency,
+        cache,
+        history,
+    )
+    if not batch_mode:
+        print(client.json_stdout(client.fetch_metrics()))
+        return
+
+    # Batch mode: stream one NDJSON record per repository as they complete.
+    for record in client.fetch_repositories(read_repositories(args.repos, args.repos_file)):
+        if "traffic" in record:
+            print(client.json_stdout(record, indent=None), flush=True)
+        else:
+            print(json.dumps(record), flush=True)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,142 @@
+import argparse
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+from python_playground.models.github_stats import WeekDay
+
+# SQLite `strftime` formats of the supported aggregation periods.
+PERIOD_FORMATS = {
+    "day": "%Y-%m-%d",
+    "week": "%Y-W%W",
+    "month": "%Y-%m",
+    "year": "%Y",
+}
+TRAFFIC_METRICS = ("views", "clones")
+
+
+class TrafficHistoryStore:
+    """Local SQLite time series of GitHub traffic (views and clones) per repository.
+
+    GitHub only keeps the last 14 days of traffic, every run upserts the points it fetched,
+    so the history grows beyond that window and can be queried without hitting the API.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS traffic (
+                    repository TEXT NOT NULL,
+                    metric TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    uniques INTEGER NOT NULL,
+                    PRIMARY KEY (repository, metric, timestamp)
+                )
+                """
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS traffic_repository_timestamp "
+                "ON traffic (repository, timestamp)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS traffic_metric_timestamp ON traffic (metric, timestamp)"
+            )
+
+    def ingest(self, repository: str, metric: str, points: Iterable[WeekDay]) -> int:
+        """Upsert the traffic points of a repository, returns the number of new or changed ones."""
+        if metric not in TRAFFIC_METRICS:
+            raise ValueError(f"Invalid traffic metric: {metric}")
+        rows = [(repository, metric, p.timestamp, p.count, p.uniques) for p in points]
+        with self._lock, self._connection:
+            before = self._connection.total_changes
+            # Only touch rows that are new or whose numbers changed (the current day still grows).
+            self._connection.executemany(
+                """
+                INSERT INTO traffic (repository, metric, timestamp, count, uniques)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (repository, metric, timestamp) DO UPDATE
+                SET count = excluded.count, uniques = excluded.uniques
+                WHERE count != excluded.count OR uniques != excluded.uniques
+                """,
+                rows,
+            )
+            return self._connection.total_changes - before
+
+    def aggregate(
+        self,
+        metric: str,
+        period: str = "week",
+        repository: Optional[str] = None,
+        since: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Sum count and (daily) uniques per period, for one or all repositories."""
+        if period not in PERIOD_FORMATS:
+            raise ValueError(f"Invalid period: {period} (expected one of {list(PERIOD_FORMATS)})")
+        query = (
+            "SELECT strftime(?, timestamp) AS period, repository, SUM(count), SUM(uniques) "
+            "FROM traffic WHERE metric = ?"
+        )
+        params: List[Any] = [PERIOD_FORMATS[period], metric]
+        if repository:
+            query += " AND repository = ?"
+            params.append(repository)
+        if since:
+            query += " AND timestamp >= ?"
+            params.append(since)
+        query += " GROUP BY period, repository ORDER BY period, repository"
+        with self._lock:
+            rows = self._connection.execute(query, params).fetchall()
+        return [
+            {"period": row[0], "repository": row[1], "count": row[2], "uniques": row[3]}
+            for row in rows
+        ]
+
+    def top_repositories(
+        self, metric: str, limit: int = 10, since: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Repositories with the most traffic, optionally since an ISO date."""
+        query = "SELECT repository, SUM(count) AS total, SUM(uniques) FROM traffic WHERE metric = ?"
+        params: List[Any] = [metric]
+        if since:
+            query += " AND timestamp >= ?"
+            params.append(since)
+        query += " GROUP BY repository ORDER BY total DESC, repository LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._connection.execute(query, params).fetchall()
+        return [{"repository": row[0], "count": row[1], "uniques": row[2]} for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="GitHub Traffic History")
+    parser.add_argument("history", help="SQLite file written by `github_stats --history`")
+    parser.add_argument("-m", "--metric", default="views", choices=TRAFFIC_METRICS, type=str)
+    parser.add_argument("-p", "--period", default="week", choices=list(PERIOD_FORMATS), type=str)
+    parser.add_argument("-r", "--repository", help="Only this owner/repo", type=str)
+    parser.add_argument("-s", "--since", help="Only traffic since this ISO date", type=str)
+    parser.add_argument("--top", help="Show the top N repositories instead", type=int)
+    args = parser.parse_args()
+
+    store = TrafficHistoryStore(args.history)
+    if args.top:
+        result = store.top_repositories(args.metric, args.top, args.since)
+    else:
+        result = store.aggregate(args.metric, args.period, args.repository, args.since)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,52 +1,151 @@
+import hashlib
 import json
 import os
-from typing import Any, Optional
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import yaml
 from pydantic import ValidationError
 
 from python_playground.models.project_config import ProjectConfig
 
+# Seconds between two checks of a watched config file.
+WATCH_INTERVAL = 1.0
+
 
 class ConfigManager:
     _config: Optional[ProjectConfig] = None
+    # Per config file: (inode, size, mtime), content hash and config (`None` if invalid) of the
+    # last parsed version.
+    _cache: Dict[str, Tuple[Tuple[int, int, int], str, Optional[ProjectConfig]]] = {}
+    _subscribers: List[Callable[[ProjectConfig], None]] = []
+    _lock = threading.RLock()
+    _watcher: Optional[threading.Thread] = None
+    _stop_watching = threading.Event()
 
     @classmethod
     def load_config(cls, config_file_path: str) -> Optional[ProjectConfig]:
         """
         Load and validate configuration from a YAML file.
+
+        The result is cached by the file's mtime (and size), and by its content hash, so an
+        unchanged file is neither parsed nor validated again. An invalid file returns `None`
+        (its errors are only reported once) and keeps the current configuration.
         """
         if not os.path.exists(config_file_path):
             raise FileNotFoundError("Config file not found: %s", config_file_path)
 
-        with open(config_file_path, "r") as f:
-            raw_config = yaml.safe_load(f)
-
-        try:
-            cls._config = ProjectConfig(**raw_config)
-            return cls._config
-        except ValidationError as e:
-            errors = e.errors()
-            simplified_errors = [
-                {
-                    "msg": error["msg"],
-                    "type": error["type"],
-                    "field": error["loc"][1] if len(error["loc"]) > 1 else None,
-                }
-                for error in errors
-            ]
-            print(simplified_errors)
-            return None
+        path = os.path.abspath(config_file_path)
+        with cls._lock:
+            stat = os.stat(path)
+            file_stat = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+            cached = cls._cache.get(path)
+            if cached is not None and cached[0] == file_stat:
+                return cls._activate(cached[2])
+
+            with open(path, "rb") as f:
+                content = f.read()
+            content_hash = hashlib.sha256(content).hexdigest()
+            if cached is not None and cached[1] == content_hash:
+                # Touched, but not changed.
+                cls._cache[path] = (file_stat, content_hash, cached[2])
+                return cls._activate(cached[2])
+
+            # Until it changes, an invalid file isn't parsed again either.
+            cls._cache[path] = (file_stat, content_hash, None)
+            raw_config = yaml.safe_load(content)
+
+            try:
+                config = ProjectConfig(**raw_config)
+            except ValidationError as e:
+                errors = e.errors()
+                simplified_errors = [
+                    {
+                        "msg": error["msg"],
+                        "type": error["type"],
+                        "field": error["loc"][1] if len(error["loc"]) > 1 else None,
+                    }
+                    for error in errors
+                ]
+                print(simplified_errors)
+                return None
+
+            cls._cache[path] = (file_stat, content_hash, config)
+            return cls._activate(config)
 
     @classmethod
     def get_config(cls) -> Optional[ProjectConfig]:
         """
         Access the loaded configuration. Ensures configuration is loaded.
+
+        While the config file is watched, this is always the latest valid configuration.
         """
         if cls._config is None:
             raise ValueError("Configuration has not been loaded.")
         return cls._config
 
+    @classmethod
+    def subscribe(cls, callback: Callable[[ProjectConfig], None]) -> Callable[[], None]:
+        """
+        Call `callback` with every new configuration, returns a function that unsubscribes it.
+        """
+        with cls._lock:
+            cls._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with cls._lock:
+                if callback in cls._subscribers:
+                    cls._subscribers.remove(callback)
+
+        return unsubscribe
+
+    @classmethod
+    def watch(cls, config_file_path: str, interval: float = WATCH_INTERVAL) -> None:
+        """
+        Load the config file and reload it in a background thread whenever it changes.
+
+        Polls the file's mtime every `interval` seconds, which also works for editors and
+        deployments that replace the file instead of writing to it. Edits that can't be parsed
+        or validated are reported and ignored until the file is fixed.
+        """
+        cls.stop_watching()
+        if cls.load_config(config_file_path) is None:
+            raise ValueError(f"Invalid config file: {config_file_path}")
+
+        stop = cls._stop_watching = threading.Event()
+
+        def poll() -> None:
+            while not stop.wait(interval):
+                try:
+                    cls.load_config(config_file_path)
+                except Exception as e:
+                    # E.g. a YAML syntax error, or the file being replaced right now.
+                    print(f"Config reload failed: {e}")
+
+        cls._watcher = threading.Thread(target=poll, name="config-watcher", daemon=True)
+        cls._watcher.start()
+
+    @classmethod
+    def stop_watching(cls) -> None:
+        cls._stop_watching.set()
+        if cls._watcher is not None:
+            cls._watcher.join()
+            cls._watcher = None
+
+    @classmethod
+    def _activate(cls, config: Optional[ProjectConfig]) -> Optional[ProjectConfig]:
+        if config is None:
+            return None
+        # Readers see either the previous or the new config, never a partially updated one.
+        previous, cls._config = cls._config, config
+        if config is not previous:
+            for callback in list(cls._subscribers):
+                try:
+                    callback(config)
+                except Exception as e:
+                    print(f"Config subscriber failed: {e}")
+        return config
+
 
 def main() -> None:
     config = ConfigManager.load_config("python_playground/assets/config.yaml")
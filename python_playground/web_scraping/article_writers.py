@@ -0,0 +1,231 @@
+import csv
+import importlib
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import IO, Any, Dict, Iterator, List, Optional, Set, Type
+
+
+def _optional_import(name: str) -> Any:
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+# Optional, only required by the `parquet` output format.
+pyarrow = _optional_import("pyarrow")
+parquet = _optional_import("pyarrow.parquet")
+
+# Records buffered before they're written (Parquet: rows per row group).
+FLUSH_EVERY = 100
+# Seconds after which buffered records are written anyway, e.g. on a slowly scrolling blog.
+FLUSH_INTERVAL = 5.0
+
+
+class ArticleWriter(ABC):
+    """Appends scraped articles to a file while they're extracted, instead of all at the end.
+
+    Records are buffered and written every `flush_every` records or `flush_interval` seconds,
+    so a crash loses at most those. Records with a `key` (e.g. the link) that has already been
+    written, by this writer or to the existing file, are skipped. The file is only created once
+    the first record is written, and writers are safe to share between threads.
+    """
+
+    extension = ""
+    # Whether flushed records survive a crash, i.e. before `close()`.
+    durable_flush = True
+
+    def __init__(
+        self,
+        path: str,
+        fieldnames: List[str],
+        key: Optional[str] = "link",
+        flush_every: int = FLUSH_EVERY,
+        flush_interval: float = FLUSH_INTERVAL,
+    ):
+        self.path = path
+        self.fieldnames = fieldnames
+        self.key = key
+        self.flush_every = max(1, flush_every)
+        self.flush_interval = flush_interval
+        self.written = 0
+        self._buffer: List[Dict[str, str]] = []
+        self._seen: Set[str] = set()
+        self._last_flush = time.monotonic()
+        self._opened = False
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "ArticleWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def write(self, article: Dict[str, str]) -> bool:
+        """Queue an article, `False` if it's a duplicate."""
+        with self._lock:
+            if not self._opened:
+                self._open()
+                self._opened = True
+            if self.key is not None:
+                key = article.get(self.key) or ""
+                if key in self._seen:
+                    return False
+                # Articles without the key (e.g. no link found) can't be told apart.
+                if key:
+                    self._seen.add(key)
+            self._buffer.append(article)
+            if (
+                len(self._buffer) >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            ):
+                self._flush()
+            return True
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush()
+            if self._opened:
+                self._close()
+                self._opened = False
+
+    def _flush(self) -> None:
+        if self._buffer:
+            self._write(self._buffer)
+            self.written += len(self._buffer)
+            self._buffer = []
+        self._last_flush = time.monotonic()
+
+    @abstractmethod
+    def _open(self) -> None: ...
+
+    @abstractmethod
+    def _write(self, articles: List[Dict[str, str]]) -> None: ...
+
+    @abstractmethod
+    def _close(self) -> None: ...
+
+
+class TextArticleWriter(ArticleWriter, ABC):
+    """Line based formats, appended to an existing file (whose keys are read first)."""
+
+    _file: IO[str]
+
+    def _open(self) -> None:
+        exists = os.path.exists(self.path) and os.path.getsize(self.path) > 0
+        if exists and self.key is not None:
+            self._seen.update(key for key in self._existing_keys() if key)
+        self._file = open(self.path, "a", newline="", encoding="utf-8")
+        if not exists:
+            self._start()
+
+    def _write(self, articles: List[Dict[str, str]]) -> None:
+        self._write_lines(articles)
+        self._file.flush()
+
+    def _close(self) -> None:
+        self._file.close()
+
+    def _start(self) -> None:
+        pass
+
+    @abstractmethod
+    def _existing_keys(self) -> Iterator[str]: ...
+
+    @abstractmethod
+    def _write_lines(self, articles: List[Dict[str, str]]) -> None: ...
+
+
+class CsvArticleWriter(TextArticleWriter):
+    extension = "csv"
+
+    def _start(self) -> None:
+        csv.DictWriter(self._file, fieldnames=self.fieldnames).writeheader()
+
+    def _existing_keys(self) -> Iterator[str]:
+        with open(self.path, "r", newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                yield row.get(self.key or "") or ""
+
+    def _write_lines(self, articles: List[Dict[str, str]]) -> None:
+        writer = csv.DictWriter(self._file, fieldnames=self.fieldnames, extrasaction="ignore")
+        writer.writerows(articles)
+
+
+class NdjsonArticleWriter(TextArticleWriter):
+    """One JSON object per line."""
+
+    extension = "ndjson"
+
+    def _existing_keys(self) -> Iterator[str]:
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield str(json.loads(line).get(self.key) or "")
+                except ValueError:
+                    # The last line of a crashed run may be incomplete.
+                    continue
+
+    def _write_lines(self, articles: List[Dict[str, str]]) -> None:
+        self._file.writelines(
+            json.dumps({name: article.get(name) for name in self.fieldnames}) + "\n"
+            for article in articles
+        )
+
+
+class ParquetArticleWriter(ArticleWriter):
+    """Columnar output for large combined datasets, one row group per flush.
+
+    Parquet files can't be appended to, and are only readable once they've been closed. The
+    rows are written to `<path>.tmp`, starting with a copy of the existing file (batch by
+    batch), which only replaces `path` in `close()`. A crash leaves the previous file intact.
+    """
+
+    extension = "parquet"
+    durable_flush = False
+
+    def __init__(self, path: str, fieldnames: List[str], *args: Any, **kwargs: Any):
+        if parquet is None:
+            raise ImportError("The parquet output format requires pyarrow (pip install pyarrow).")
+        super().__init__(path, fieldnames, *args, **kwargs)
+        self._schema = pyarrow.schema([(name, pyarrow.string()) for name in fieldnames])
+        self._writer: Any = None
+        self._temporary_path = f"{path}.tmp"
+
+    def _open(self) -> None:
+        self._writer = parquet.ParquetWriter(self._temporary_path, self._schema)
+        if os.path.exists(self.path):
+            for batch in parquet.ParquetFile(self.path).iter_batches(columns=self.fieldnames):
+                if self.key is not None:
+                    self._seen.update(key for key in batch.column(self.key).to_pylist() if key)
+                self._writer.write_batch(batch)
+
+    def _write(self, articles: List[Dict[str, str]]) -> None:
+        self._writer.write_table(pyarrow.Table.from_pylist(articles, schema=self._schema))
+
+    def _close(self) -> None:
+        self._writer.close()
+        # Atomic, `path` is always a complete file.
+        os.replace(self._temporary_path, self.path)
+
+
+WRITERS: Dict[str, Type[ArticleWriter]] = {
+    "csv": CsvArticleWriter,
+    "ndjson": NdjsonArticleWriter,
+    "parquet": ParquetArticleWriter,
+}
+
+
+def create_writer(output_format: str, path: str, fieldnames: List[str]) -> ArticleWriter:
+    try:
+        writer_class = WRITERS[output_format]
+    except KeyError:
+        raise ValueError(f"Unknown output format '{output_format}', use one of {list(WRITERS)}.")
+    return writer_class(path, fieldnames)
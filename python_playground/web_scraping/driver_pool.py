@@ -0,0 +1,116 @@
+import contextlib
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+class DriverPool:
+    """A bounded pool of WebDriver instances shared by worker threads.
+
+    Drivers are created on demand, up to `size`, and handed back to the pool after use, so
+    every worker reuses a warm browser instead of starting a new one per blog. `reset` is
+    called with a driver before it goes back to the pool, and after `max_uses` borrows a
+    driver is quit and replaced by a new one, so a leaking browser can't grow forever.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        factory: Callable[[], Any],
+        max_uses: Optional[int] = None,
+        reset: Optional[Callable[[Any], None]] = None,
+    ):
+        self.size = max(1, size)
+        self.factory = factory
+        self.max_uses = max_uses
+        self.reset = reset
+        self.recycled = 0
+        self._idle: "queue.Queue[Any]" = queue.Queue()
+        self._drivers: List[Any] = []
+        self._uses: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "DriverPool":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @contextlib.contextmanager
+    def driver(self) -> Iterator[Any]:
+        """Borrow a driver, blocking while all of them are in use."""
+        driver = self._acquire()
+        try:
+            yield driver
+        finally:
+            self._release(driver)
+
+    def close(self) -> None:
+        with self._lock:
+            drivers, self._drivers = self._drivers, []
+            self._uses = {}
+        for driver in drivers:
+            self._quit(driver)
+
+    def _release(self, driver: Any) -> None:
+        with self._lock:
+            uses = self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+            recycle = self.max_uses is not None and uses >= self.max_uses
+            if recycle:
+                # Frees the slot, the next borrower starts a new browser.
+                self._drivers.remove(driver)
+                del self._uses[id(driver)]
+                self.recycled += 1
+        if recycle:
+            self._quit(driver)
+            # Wakes up a borrower that's waiting for a driver, it'll create the replacement.
+            self._idle.put(None)
+            return
+        if self.reset is not None:
+            try:
+                self.reset(driver)
+            except Exception:
+                # A browser that can't be reset isn't worth keeping.
+                with self._lock:
+                    self._drivers.remove(driver)
+                    self._uses.pop(id(driver), None)
+                self._quit(driver)
+                self._idle.put(None)
+                return
+        self._idle.put(driver)
+
+    @staticmethod
+    def _quit(driver: Any) -> None:
+        try:
+            driver.quit()
+        except Exception:
+            # The browser may already be gone, e.g. after a crash.
+            pass
+
+    def _acquire(self) -> Any:
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            # `None` only signals a free slot.
+            if driver is not None:
+                return driver
+        with self._lock:
+            create = len(self._drivers) < self.size
+            if create:
+                # Reserve the slot, the browser is started outside of the lock.
+                self._drivers.append(None)
+        if not create:
+            driver = self._idle.get()
+            return driver if driver is not None else self._acquire()
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._lock:
+                self._drivers.remove(None)
+            self._idle.put(None)
+            raise
+        with self._lock:
+            self._drivers[self._drivers.index(None)] = driver
+        return driver
@@ -1,32 +1,84 @@
-import csv
+import argparse
+import functools
+import json
 import os
 import re
+import sys
 import time
-from typing import Any, Generator
-from urllib.parse import urljoin, urlparse
-
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+from urllib.parse import urlparse
+
+import httpx
 from fake_useragent import UserAgent
 from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from python_playground.web_scraping.article_writers import (
+    WRITERS,
+    ArticleWriter,
+    create_writer,
+)
+from python_playground.web_scraping.driver_pool import DriverPool
+from python_playground.web_scraping.medium_http import (
+    MediumHttpError,
+    create_client,
+    scrape_blog_http,
+)
+from python_playground.web_scraping.medium_parser import is_valid_url, parse_articles
 
 ua: Any = UserAgent()
 
-
-def is_valid_url(url: str) -> bool:
-    # Check for a valid scheme and netloc.
-    parsed_url = urlparse(url)
-    if not parsed_url.scheme or not parsed_url.netloc:
-        return False
-
-    # Regular expression for validating a URL.
-    regex = re.compile(
-        r"^(?:http|ftp)s?://"
-        r"(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)"  # noga
-        r"(?:/?|[/?]\S+)$",
-        re.IGNORECASE,
-    )
-
-    return re.match(regex, url) is not None
+CSV_FIELDNAMES = ["title", "link", "published"]
+# `auto` tries the browserless HTTP engine first and falls back to Selenium.
+ENGINES = ("auto", "http", "selenium")
+
+# Seconds to wait for more articles after scrolling to the bottom, before assuming the end.
+SCROLL_TIMEOUT = 5.0
+# Upper bound of the seconds spent scrolling through a single blog.
+SCRAPE_TIMEOUT = 600.0
+# How often the article count is checked while waiting.
+POLL_FREQUENCY = 0.1
+# Blogs a browser scrapes before it's replaced by a new one, Chrome's memory use only grows.
+MAX_PAGES_PER_DRIVER = 20
+# Chrome only has a content setting for images, audio and video are blocked by URL.
+BLOCKED_CONTENT_PREFS = {"profile.managed_default_content_settings.images": 2}
+# Articles are rendered by Medium's own scripts (`cdn-client.medium.com`, also on custom
+# domains), only media, fonts and known third-party scripts can go.
+BLOCKED_URL_PATTERNS = [
+    *(f"*.{extension}*" for extension in ("png", "jpg", "jpeg", "gif", "webp", "avif", "svg")),
+    *(f"*.{extension}*" for extension in ("mp4", "webm", "mp3", "woff", "woff2", "ttf", "otf")),
+    "*miro.medium.com*",
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*facebook.net*",
+    "*branch.io*",
+    "*sentry-cdn.com*",
+    "*recaptcha*",
+]
+IS_MEDIUM_SCRIPT = "return !!document.querySelector('meta[content=\"com.medium.reader\"]');"
+COUNT_NEW_ARTICLES_SCRIPT = (
+    "return document.querySelectorAll('article:not([data-scraped])').length;"
+)
+# Marks the articles rendered since the last call and returns their HTML, so every article is
+# only transferred and parsed once (also if the page removes articles scrolled out of view).
+NEW_ARTICLES_SCRIPT = """
+const articles = Array.from(document.querySelectorAll('article:not([data-scraped])'));
+articles.forEach((article) => article.setAttribute('data-scraped', ''));
+return articles.map((article) => article.outerHTML);
+"""
 
 
 def spinner() -> Generator[str, None, None]:
@@ -42,25 +94,16 @@ def status_loader_text(articles_found: int, spinner_char: str) -> str:
     return f"\r{base_text.format(articles_found)}{filler_spaces*' '} [{spinner_char}]"
 
 
-def main() -> None:
-    # ----- Site configuration -----
-    scroll_pause_time = 2
-    scrolls_before_check = 2
-    default_blog_url = "https://rschu.me"
-    blog_url = (
-        input(f"Enter the Medium Blog URL (e.g., {default_blog_url}): ").strip("/")
-        or default_blog_url
-    )
-
-    if not is_valid_url(blog_url):
-        print(f"The given URL '{blog_url}' appears to be invalid.", end="", flush=True)
-        exit(0)
+class NotAMediumBlogError(Exception):
+    pass
 
-    spin = spinner()
 
-    print(f"Processing Blog articles from: {blog_url}")
+def create_driver(block_resources: bool = True) -> webdriver.Chrome:
+    """Headless Chrome, by default without images, media, fonts and tracking scripts.
 
-    # ----- Webdriver setup -----
+    Images are disabled in the preferences, everything else is blocked by URL through the
+    DevTools protocol (`Network.setBlockedURLs`), which Chrome applies to every request.
+    """
     options = webdriver.ChromeOptions()
     options.add_argument("--headless")
     options.add_argument("window-size=1920x1080")
@@ -68,108 +111,440 @@ def main() -> None:
     options.add_argument(f"user-agent={ua.random}")
     options.add_experimental_option("excludeSwitches", ["enable-automation"])
     options.add_experimental_option("useAutomationExtension", False)
+    if block_resources:
+        options.add_experimental_option("prefs", BLOCKED_CONTENT_PREFS)
     driver = webdriver.Chrome(options=options)
+    if block_resources:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    return driver
+
+
+def reset_driver(driver: webdriver.Chrome) -> None:
+    """Drop the page of the previous blog (with all its articles) before the driver is reused."""
+    driver.get("about:blank")
+
+
+def count_new_articles(driver: webdriver.Chrome) -> int:
+    return int(driver.execute_script(COUNT_NEW_ARTICLES_SCRIPT))
+
+
+def wait_for_new_articles(driver: webdriver.Chrome, timeout: float) -> bool:
+    """Wait until new articles rendered, False if none did in time.
+
+    The condition is checked right away and then every `POLL_FREQUENCY` seconds, so there's
+    no fixed delay when the next articles are already there.
+    """
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until(
+            lambda d: count_new_articles(d) > 0
+        )
+        return True
+    except TimeoutException:
+        return False
+
+
+def iter_blog_articles(
+    driver: webdriver.Chrome,
+    blog_url: str,
+    on_progress: Optional[Callable[[int], None]] = None,
+    scroll_timeout: float = SCROLL_TIMEOUT,
+    timeout: float = SCRAPE_TIMEOUT,
+) -> Iterator[Dict[str, str]]:
+    """Scroll through a Medium blog, yielding the title, link and publishing date of articles.
+
+    Articles are yielded as soon as they're extracted, nothing is kept but their links.
+    Scrolling stops once no more articles render within `scroll_timeout` seconds after
+    scrolling to the bottom (the end of the blog), or after `timeout` seconds overall.
+    """
+    deadline = time.monotonic() + timeout
+
     driver.get(blog_url)
 
+    if not driver.execute_script(IS_MEDIUM_SCRIPT):
+        raise NotAMediumBlogError(f"'{blog_url}' does not appear to be a Medium blog.")
+
     # ----- Scrolling and data extraction -----
-    last_height = driver.execute_script("return document.body.scrollHeight")  # type: ignore
-    articles_data = []
+    articles_found = 0
+    # Articles can be rendered again (e.g. after a re-render), only keep the first one per link.
+    seen_links = set()
 
     while True:
-        # Scroll to the bottom of the page.
-        for _ in range(scrolls_before_check):
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")  # type: ignore
-            time.sleep(scroll_pause_time)
-
-        html_content = driver.page_source
-        soup = BeautifulSoup(html_content, "html.parser")
-
-        is_medium_url = bool(soup.find("meta", {"content": "com.medium.reader"}))
-        if not is_medium_url:
-            print(
-                f"\r'{blog_url}' does not appear to be a Medium blog.",
-                end="",
-                flush=True,
-            )
-            exit(0)
-
-        # Check if we've reached the end of the page.
-        new_height = driver.execute_script("return document.body.scrollHeight")  # type: ignore
-        if new_height == last_height:
+        # Only the articles rendered since the last iteration.
+        html_content = "".join(driver.execute_script(NEW_ARTICLES_SCRIPT))
+        for article in parse_articles(html_content, blog_url):
+            key = article["link"] or article["title"]
+            if key not in seen_links:
+                seen_links.add(key)
+                articles_found += 1
+                yield article
+
+        if on_progress is not None:
+            on_progress(articles_found)
+
+        # Scroll to the bottom of the page, which loads the next articles.
+        remaining = deadline - time.monotonic()
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")  # type: ignore
+        if remaining <= 0 or not wait_for_new_articles(driver, min(scroll_timeout, remaining)):
             break
-        last_height = new_height
 
-        # Extract articles from the page.
-        articles = soup.find_all("article")
-        for article in articles:
-            link_url = ""
-            publishing_date = "not-found"
-            links = article.find_all("a")
-
-            # Find the primary article link within the 'article' block.
-            for link in links:
-                href = link.get("href")
-                if href and href.startswith("/"):
-                    parsed_url = urlparse(href)
-                    full_url = urljoin(blog_url, parsed_url.path)
-                    link_url = full_url
-                    break
-
-            date_pattern = re.compile(
-                r"\bJan|Feb|Mar|Apr|May|Jun|Jul|" r"Aug|Sep|Oct|Nov|Dec\b \d{1,2}, \d{4}"
-            )
-            date_tag = article.find(string=date_pattern)
-            if date_tag:
-                publishing_date = date_tag
-
-            title = article.find("h2")
-            if title:
-                articles_data.append(
-                    {
-                        "title": title.text,
-                        "link": link_url,
-                        "published": publishing_date,
-                    }
-                )
 
+def blog_slug(blog_url: str) -> str:
+    """File name friendly name of a blog, e.g. `rschu.me` or `medium.com_@user`."""
+    parsed_url = urlparse(blog_url)
+    return re.sub(r"[^\w.@-]+", "_", f"{parsed_url.netloc}{parsed_url.path}").strip("_")
+
+
+def read_blog_urls(blogs: Optional[str], blogs_file: Optional[str]) -> List[str]:
+    """The blog URLs given on the command line and/or in a file (one per line)."""
+    blog_urls = [blog.strip() for blog in (blogs or "").split(",") if blog.strip()]
+    if blogs_file:
+        with sys.stdin if blogs_file == "-" else open(blogs_file, "r") as f:
+            for line in f:
+                line = line.split("#", 1)[0].strip()
+                if line:
+                    blog_urls.append(line)
+    # Keep the order, skip duplicates.
+    return list(dict.fromkeys(blog_url.strip("/") for blog_url in blog_urls))
+
+
+class BlogCheckpoints:
+    """One JSON file per completely scraped blog, so an interrupted batch run resumes after it."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, blog_url: str) -> str:
+        return os.path.join(self.directory, f"{blog_slug(blog_url)}.json")
+
+    def load(self, blog_url: str) -> Optional[int]:
+        """The number of articles of a scraped blog, `None` if it hasn't been scraped yet."""
+        try:
+            with open(self.path(blog_url), "r") as f:
+                return int(json.load(f)["articles"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self, blog_url: str, articles_count: int) -> None:
+        path = self.path(blog_url)
+        with open(f"{path}.tmp", "w") as f:
+            json.dump({"blog_url": blog_url, "articles": articles_count}, f)
+        # Atomic, a crash never leaves a half written checkpoint behind.
+        os.replace(f"{path}.tmp", path)
+
+
+def scrape_blog_without_browser(
+    blog_url: str, engine: str, client: Optional[httpx.Client] = None
+) -> Optional[List[Dict[str, str]]]:
+    """The articles scraped by the HTTP engine, or `None` if Selenium has to take over.
+
+    In `auto` mode, only the complete JSON stream is accepted. The RSS feed (the latest
+    articles only) is good enough for `--engine http`.
+    """
+    if engine == "selenium":
+        return None
+    try:
+        articles_data, complete = scrape_blog_http(blog_url, client)
+    except MediumHttpError:
+        if engine == "http":
+            raise
+        return None
+    if engine == "http":
+        return articles_data
+    # An empty stream is more likely a blocked request than a blog without articles.
+    return articles_data if complete and articles_data else None
+
+
+def scrape_blogs(
+    blog_urls: List[str],
+    workers: int,
+    output_dir: str,
+    combined: Optional[str] = None,
+    checkpoint_dir: Optional[str] = None,
+    scroll_timeout: float = SCROLL_TIMEOUT,
+    timeout: float = SCRAPE_TIMEOUT,
+    engine: str = "auto",
+    output_format: str = "csv",
+    max_pages_per_driver: Optional[int] = MAX_PAGES_PER_DRIVER,
+    block_resources: bool = True,
+) -> None:
+    """Batch mode: scrape many blogs in parallel.
+
+    Every worker reads the blog with the shared HTTP client first (depending on `engine`), and
+    only starts a headless Chrome if that fails. Articles are appended to the output files
+    while they're scraped; the combined file lists them in the order the blogs complete.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    # The checkpoints only record which blogs are in the output, a combined file has its own.
+    checkpoints = BlogCheckpoints(
+        checkpoint_dir
+        or os.path.join(output_dir, ".checkpoints", *([combined] if combined else []))
+    )
+    fieldnames = ["blog", *CSV_FIELDNAMES] if combined else CSV_FIELDNAMES
+    extension = WRITERS[output_format].extension
+
+    pending = [blog_url for blog_url in blog_urls if checkpoints.load(blog_url) is None]
+    if len(pending) < len(blog_urls):
+        print(
+            f"Resuming: {len(blog_urls) - len(pending)} of {len(blog_urls)} blogs already scraped"
+        )
+
+    def scrape(blog_url: str) -> int:
+        """Write the articles of a blog as they're scraped, returns how many were new."""
+        if not is_valid_url(blog_url):
+            raise ValueError(f"The given URL '{blog_url}' appears to be invalid.")
+        writer = combined_writer or create_writer(
+            output_format,
+            os.path.join(output_dir, f"blog_articles_{blog_slug(blog_url)}.{extension}"),
+            fieldnames,
+        )
+        try:
+            articles_data = scrape_blog_without_browser(blog_url, engine, client)
+            if articles_data is not None:
+                return write_articles(writer, blog_url, articles_data, bool(combined))
+            with pool.driver() as driver:
+                articles = iter_blog_articles(driver, blog_url, None, scroll_timeout, timeout)
+                return write_articles(writer, blog_url, articles, bool(combined))
+        finally:
+            if writer is not combined_writer:
+                writer.close()
+
+    combined_writer = (
+        create_writer(output_format, os.path.join(output_dir, combined), fieldnames)
+        if combined
+        else None
+    )
+    # Checkpoints of blogs whose articles are only safe once the combined file is closed.
+    deferred: List[Tuple[str, int]] = []
+    with (
+        create_client() as client,
+        DriverPool(
+            workers,
+            functools.partial(create_driver, block_resources),
+            max_pages_per_driver,
+            reset_driver,
+        ) as pool,
+        ThreadPoolExecutor(workers) as executor,
+    ):
+        futures = {executor.submit(scrape, blog_url): blog_url for blog_url in pending}
+        for done, future in enumerate(as_completed(futures), len(blog_urls) - len(pending) + 1):
+            blog_url = futures[future]
+            try:
+                articles_count = future.result()
+            except Exception as e:
+                print(f"[{done}/{len(blog_urls)}] {blog_url}: {e}", flush=True)
+                continue
+            print(f"[{done}/{len(blog_urls)}] {blog_url}: {articles_count} articles", flush=True)
+            if combined_writer is None or combined_writer.durable_flush:
+                if combined_writer is not None:
+                    # A checkpointed blog must not lose its articles to a later crash.
+                    combined_writer.flush()
+                checkpoints.save(blog_url, articles_count)
+            else:
+                # E.g. Parquet, whose rows are only in the file once it's closed.
+                deferred.append((blog_url, articles_count))
+
+    if combined_writer is not None:
+        combined_writer.close()
+        for blog_url, articles_count in deferred:
+            checkpoints.save(blog_url, articles_count)
+        print(f"\nFile created: {os.path.abspath(combined_writer.path)}")
+
+
+def write_articles(
+    writer: ArticleWriter, blog_url: str, articles: Iterable[Dict[str, str]], with_blog: bool
+) -> int:
+    """Stream articles into a writer, returns the number of articles that weren't duplicates."""
+    return sum(
+        writer.write({"blog": blog_url, **article} if with_blog else article)
+        for article in articles
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Medium Blog Scraper")
+    parser.add_argument(
+        "--blogs",
+        required=False,
+        help="Batch mode: comma-separated list of Medium blog URLs",
+        type=str,
+    )
+    parser.add_argument(
+        "--blogs-file",
+        required=False,
+        help="Batch mode: file with one Medium blog URL per line ('-' reads from stdin)",
+        type=str,
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        required=False,
+        default=4,
+        help="Batch mode: number of headless browsers scraping in parallel (default: 4)",
+        type=int,
+    )
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        required=False,
+        default=".",
+        help="Batch mode: directory of the CSV files (default: current directory)",
+        type=str,
+    )
+    parser.add_argument(
+        "--combined",
+        required=False,
+        help="Batch mode: write all articles to this one CSV file instead of one per blog",
+        type=str,
+    )
+    parser.add_argument(
+        "--checkpoint-dir",
+        required=False,
+        help="Batch mode: per-blog checkpoint directory (default: <output-dir>/.checkpoints)",
+        type=str,
+    )
+    parser.add_argument(
+        "--scroll-timeout",
+        required=False,
+        default=SCROLL_TIMEOUT,
+        help=f"Seconds to wait for more articles after scrolling down (default: {SCROLL_TIMEOUT})",
+        type=float,
+    )
+    parser.add_argument(
+        "--timeout",
+        required=False,
+        default=SCRAPE_TIMEOUT,
+        help=f"Maximum seconds spent scrolling through a blog (default: {SCRAPE_TIMEOUT})",
+        type=float,
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        required=False,
+        choices=list(WRITERS),
+        default="csv",
+        help="Output file format, parquet requires pyarrow (default: csv)",
+        type=str,
+    )
+    parser.add_argument(
+        "--max-pages-per-browser",
+        required=False,
+        default=MAX_PAGES_PER_DRIVER,
+        help=f"Batch mode: blogs per browser before a restart (default: {MAX_PAGES_PER_DRIVER})",
+        type=int,
+    )
+    parser.add_argument(
+        "--load-resources",
+        action="store_true",
+        help="Load images, media, fonts and tracking scripts, which are blocked by default",
+    )
+    parser.add_argument(
+        "--engine",
+        required=False,
+        choices=ENGINES,
+        default="auto",
+        help="httpx (RSS/JSON feed), Selenium or httpx with a Selenium fallback (default: auto)",
+        type=str,
+    )
+    args = parser.parse_args()
+
+    if args.blogs or args.blogs_file:
+        scrape_blogs(
+            read_blog_urls(args.blogs, args.blogs_file),
+            args.workers,
+            args.output_dir,
+            args.combined,
+            args.checkpoint_dir,
+            args.scroll_timeout,
+            args.timeout,
+            args.engine,
+            args.format,
+            args.max_pages_per_browser,
+            not args.load_resources,
+        )
+        return
+
+    # ----- Site configuration -----
+    default_blog_url = "https://rschu.me"
+    blog_url = (
+        input(f"Enter the Medium Blog URL (e.g., {default_blog_url}): ").strip("/")
+        or default_blog_url
+    )
+
+    if not is_valid_url(blog_url):
+        print(f"The given URL '{blog_url}' appears to be invalid.", end="", flush=True)
+        exit(0)
+
+    spin = spinner()
+
+    print(f"Processing Blog articles from: {blog_url}")
+
+    def on_progress(articles_found: int) -> None:
         print(
-            f"\r{status_loader_text(len(articles_data), next(spin))}",
+            f"\r{status_loader_text(articles_found, next(spin))}",
             end="",
             flush=True,
         )
 
+    try:
+        http_articles_data = scrape_blog_without_browser(blog_url, args.engine)
+    except MediumHttpError as e:
+        print(f"\r{e}", end="", flush=True)
+        exit(0)
+
+    # Save the articles to a file (e.g. `blog_articles_rschu.me.csv`) while they're scraped.
+    domain_name = urlparse(blog_url).netloc
+    writer = create_writer(
+        args.format,
+        f"blog_articles_{domain_name}.{WRITERS[args.format].extension}",
+        CSV_FIELDNAMES,
+    )
+    first_article: Optional[Dict[str, str]] = None
+    articles_found = 0
+
+    # ----- Webdriver setup -----
+    driver = None
+    try:
+        if http_articles_data is not None:
+            articles: Iterable[Dict[str, str]] = http_articles_data
+            on_progress(len(http_articles_data))
+        else:
+            driver = create_driver(not args.load_resources)
+            articles = iter_blog_articles(
+                driver, blog_url, on_progress, args.scroll_timeout, args.timeout
+            )
+        for article in articles:
+            first_article = first_article or article
+            articles_found += 1
+            writer.write(article)
+    except NotAMediumBlogError as e:
+        print(f"\r{e}", end="", flush=True)
+        exit(0)
+    finally:
+        writer.close()
+        # Close the browser.
+        if driver is not None:
+            driver.quit()
+
     # ----- Results -----
-    result_text = f"{len(articles_data)} Articles found"
+    result_text = f"{articles_found} Articles found"
     separator_line = "-" * len(result_text)
 
     print(f"\n\n{separator_line}")
     print(result_text)
     print(f"{separator_line}")
 
-    if len(articles_data) > 0:
+    if first_article is not None:
         print("\nExample:")
-        print("Title: ", articles_data[0]["title"])
-        print("Link: ", articles_data[0]["link"])
-        print("Published at: ", articles_data[0]["published"])
-
-        try:
-            # Save the result to a CSV file.
-            domain_name = urlparse(blog_url).netloc
-            csv_filename = f"blog_articles_{domain_name}.csv"
-
-            with open(csv_filename, "w", newline="") as csvfile:
-                fieldnames = ["title", "link", "published"]
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-                writer.writeheader()
-                writer.writerows(articles_data)
-
-                print(f"\nCSV file created: {os.path.abspath(csv_filename)}")
-        except Exception as e:
-            print(f"Error: {str(e)}")
-
-    # Close the browser.
-    driver.quit()
+        print("Title: ", first_article["title"])
+        print("Link: ", first_article["link"])
+        print("Published at: ", first_article["published"])
+
+    if writer.written > 0:
+        print(f"\n{args.format.upper()} file created: {os.path.abspath(writer.path)}")
+    elif articles_found > 0:
+        print(f"\nNo new articles, {os.path.abspath(writer.path)} is up to date.")
 
 
 if __name__ == "__main__":
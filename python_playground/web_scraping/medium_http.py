@@ -0,0 +1,148 @@
+import json
+import xml.etree.ElementTree as ElementTree
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse, urlunparse
+
+import httpx
+
+# Medium prefixes its JSON responses to prevent JSON hijacking.
+JSON_PREFIX = "])}while(1);</x>"
+# Posts per request of the `?format=json` stream.
+PAGE_LIMIT = 25
+# Upper bound of stream requests per blog.
+MAX_PAGES = 400
+
+
+# Seconds per request, Medium answers quickly or not at all.
+REQUEST_TIMEOUT = 10.0
+
+
+class MediumHttpError(Exception):
+    """The blog couldn't be read without a browser, e.g. not a Medium blog or a changed API."""
+
+
+def create_client() -> httpx.Client:
+    """An HTTP client that can be shared by worker threads."""
+    return httpx.Client(follow_redirects=True, timeout=REQUEST_TIMEOUT)
+
+
+def format_published(published: datetime) -> str:
+    """Publishing date as shown on the blog (and scraped by the Selenium engine): `Dec 28, 2021`."""
+    return f"{published:%b} {published.day}, {published.year}"
+
+
+def feed_url(blog_url: str) -> str:
+    """RSS feed of a blog: `https://medium.com/feed/@user` or `https://<custom domain>/feed`."""
+    parsed_url = urlparse(blog_url)
+    path = parsed_url.path.strip("/")
+    if parsed_url.netloc in ("medium.com", "www.medium.com") and path:
+        return urlunparse(parsed_url._replace(path=f"/feed/{path}", query=""))
+    return urlunparse(parsed_url._replace(path=f"/{path}/feed" if path else "/feed", query=""))
+
+
+def parse_json_stream(text: str) -> Dict[str, Any]:
+    if not text.startswith(JSON_PREFIX):
+        raise MediumHttpError("Not a Medium JSON response.")
+    try:
+        return dict(json.loads(text.removeprefix(JSON_PREFIX)))
+    except ValueError as e:
+        raise MediumHttpError(f"Invalid Medium JSON response: {e}")
+
+
+def parse_feed(xml: str) -> List[Dict[str, str]]:
+    """Articles of a Medium RSS feed, the link without the tracking query."""
+    try:
+        channel = ElementTree.fromstring(xml).find("channel")
+    except ElementTree.ParseError as e:
+        raise MediumHttpError(f"Invalid RSS feed: {e}")
+    if channel is None:
+        raise MediumHttpError("Invalid RSS feed: no channel.")
+    # Other blogs (e.g. WordPress) serve an RSS feed at `/feed` as well.
+    if (channel.findtext("generator") or "").strip().lower() != "medium":
+        raise MediumHttpError("Not a Medium RSS feed.")
+    articles_data = []
+    for item in channel.iter("item"):
+        link = urlunparse(urlparse(item.findtext("link", "").strip())._replace(query=""))
+        pub_date = item.findtext("pubDate")
+        articles_data.append(
+            {
+                "title": item.findtext("title", "").strip(),
+                "link": link,
+                "published": (
+                    format_published(parsedate_to_datetime(pub_date)) if pub_date else "not-found"
+                ),
+            }
+        )
+    return articles_data
+
+
+def scrape_json_stream(
+    client: httpx.Client, blog_url: str, max_pages: int = MAX_PAGES
+) -> Tuple[List[Dict[str, str]], bool]:
+    """All articles of a blog, paging through Medium's `?format=json` stream of latest posts.
+
+    Returns the articles and whether the end of the stream was reached within `max_pages`.
+    """
+    articles_data = []
+    seen_links = set()
+    params: Dict[str, Any] = {"format": "json", "limit": PAGE_LIMIT}
+    for _ in range(max_pages):
+        response = client.get(f"{blog_url}/latest", params=params)
+        if response.status_code != 200:
+            raise MediumHttpError(f"Medium JSON stream failed with status {response.status_code}")
+        payload = parse_json_stream(response.text).get("payload") or {}
+        posts = (payload.get("references") or {}).get("Post") or {}
+        for post in posts.values():
+            link = f"{blog_url}/{post['uniqueSlug']}"
+            if link in seen_links:
+                continue
+            seen_links.add(link)
+            published = post.get("firstPublishedAt")
+            articles_data.append(
+                {
+                    "title": post.get("title", ""),
+                    "link": link,
+                    "published": (
+                        format_published(datetime.fromtimestamp(published / 1000, timezone.utc))
+                        if published
+                        else "not-found"
+                    ),
+                }
+            )
+        next_page = (payload.get("paging") or {}).get("next")
+        if not posts or not next_page:
+            return articles_data, True
+        params = {"format": "json", **next_page}
+    return articles_data, False
+
+
+def scrape_blog_http(
+    blog_url: str, client: Optional[httpx.Client] = None, max_pages: int = MAX_PAGES
+) -> Tuple[List[Dict[str, str]], bool]:
+    """Articles of a Medium blog without a browser: the JSON stream, or else the RSS feed.
+
+    Returns the articles and whether they're all of the blog's articles, which the RSS feed
+    never is: it only lists the latest ones (usually 10). Raises `MediumHttpError` if neither
+    works, so the caller can fall back to the Selenium engine.
+    """
+    own_client = client is None
+    http = client or create_client()
+    try:
+        try:
+            articles_data, complete = scrape_json_stream(http, blog_url, max_pages)
+            if articles_data:
+                return articles_data, complete
+        except (MediumHttpError, httpx.HTTPError, KeyError):
+            pass
+        try:
+            response = http.get(feed_url(blog_url))
+        except httpx.HTTPError as e:
+            raise MediumHttpError(f"RSS feed request failed: {e}")
+        if response.status_code != 200:
+            raise MediumHttpError(f"RSS feed request failed with status {response.status_code}")
+        return parse_feed(response.text), False
+    finally:
+        if own_client:
+            http.close()
@@ -0,0 +1,96 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlparse
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Builds the status and body of a response from the request body.
+Responder = Callable[[bytes], Tuple[int, bytes]]
+Route = Tuple[Dict[str, str], int, Union[bytes, Responder], str, Dict[str, str]]
+
+
+def fixture(*path: str) -> bytes:
+    with open(os.path.join(FIXTURES, *path), "rb") as f:
+        return f.read()
+
+
+class StubServer:
+    """A local HTTP server answering with canned responses, e.g. recorded fixtures.
+
+    `route()` registers a response for a method and path, optionally only for requests whose
+    query has the given parameters. The body can also be a `Responder`, e.g. to answer a POST
+    based on what was sent. Requests without a route get a 404, all of them are recorded, with
+    their bodies in `bodies`.
+    """
+
+    def __init__(self) -> None:
+        self.requests: List[str] = []
+        self.bodies: List[bytes] = []
+        self._routes: Dict[Tuple[str, str], List[Route]] = {}
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def __enter__(self) -> "StubServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def route(
+        self,
+        path: str,
+        body: Union[bytes, Responder] = b"",
+        status: int = 200,
+        content_type: str = "text/html; charset=utf-8",
+        query: Optional[Dict[str, str]] = None,
+        method: str = "GET",
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        route = (query or {}, status, body, content_type, headers or {})
+        self._routes.setdefault((method, path), []).insert(0, route)
+
+    def _handler(self) -> Any:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                self._respond(b"")
+
+            def do_POST(self) -> None:
+                self._respond(self.rfile.read(int(self.headers.get("Content-Length") or 0)))
+
+            def _respond(self, request_body: bytes) -> None:
+                stub.requests.append(self.path)
+                stub.bodies.append(request_body)
+                url = urlparse(self.path)
+                query = dict(parse_qsl(url.query))
+                routes = stub._routes.get((self.command, url.path), [])
+                for expected, status, body, content_type, headers in routes:
+                    if expected.items() <= query.items():
+                        break
+                else:
+                    status, body, content_type, headers = 404, b"Not found", "text/plain", {}
+                if callable(body):
+                    status, body = body(request_body)
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
@@ -0,0 +1,95 @@
+import json
+import unittest
+from typing import Any, Dict, List, Optional, Tuple
+from unittest import mock
+
+from python_playground.utils.audit_log_helper import AuditLogger
+from python_playground.utils.audit_log_retry import AuditLogApiError
+from tests.stub_server import StubServer
+
+JSON = "application/json"
+OK = b'{"ok": true}'
+
+
+def sent_events(body: bytes) -> List[int]:
+    return [event["i"] for event in json.loads(body)]
+
+
+class AuditLoggerRetryTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.stub = StubServer()
+        self.stub.__enter__()
+        self.addCleanup(self.stub.__exit__)
+        # No backoff, only `Retry-After` delays a retry.
+        self.audit_logger = AuditLogger(self.stub.url, "key", max_retries=2, backoff_base=0.0)
+        self.addCleanup(self.audit_logger.close)
+
+    def log_events(self, count: int) -> None:
+        for i in range(count):
+            self.audit_logger.log_event("role_update", "intranet", "login-frontend", "update", i=i)
+
+    def serve(self, *responses: Tuple[int, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        """Answer the bulk requests with `responses` in turn, the last one repeatedly."""
+        pending = list(responses)
+
+        def respond(body: bytes) -> Tuple[int, bytes]:
+            status, response = pending.pop(0) if len(pending) > 1 else pending[0]
+            return status, json.dumps(response).encode() if response is not None else b""
+
+        self.stub.route("/create-bulk", respond, content_type=JSON, method="POST", headers=headers)
+
+    def requests(self) -> List[List[int]]:
+        return [sent_events(body) for body in self.stub.bodies]
+
+    def test_splits_a_too_large_batch_down_to_single_events(self) -> None:
+        def respond(body: bytes) -> Tuple[int, bytes]:
+            return (413, b"") if len(sent_events(body)) > 1 else (200, OK)
+
+        self.stub.route("/create-bulk", respond, content_type=JSON, method="POST")
+        self.log_events(4)
+        self.assertEqual(self.audit_logger.send_batch(), {"ok": True})
+        self.assertEqual(self.requests(), [[0, 1, 2, 3], [0, 1], [0], [1], [2], [3]])
+        # The learned size applies to the following batches as well.
+        self.log_events(2)
+        self.audit_logger.send_batch()
+        self.assertEqual(self.requests()[-2:], [[0], [1]])
+        self.assertEqual(self.audit_logger.metrics.counter("events_sent"), 6)
+
+    def test_resends_only_the_failed_items(self) -> None:
+        statuses = [200, 503, 400, 429]
+        items: Dict[str, Any] = {
+            "errors": True,
+            "items": [{"index": {"status": status}} for status in statuses],
+        }
+        self.serve((200, items), (200, {"errors": False, "items": []}))
+        self.log_events(4)
+        self.audit_logger.send_batch()
+        self.assertEqual(self.requests(), [[0, 1, 2, 3], [1, 3]])
+        # The 400 won't get any better by sending it again.
+        self.assertEqual(self.audit_logger.dropped_events, 1)
+        self.assertEqual(self.audit_logger.metrics.counter("events_sent"), 3)
+
+    def test_honors_retry_after(self) -> None:
+        self.serve((503, None), (200, {"ok": True}), headers={"Retry-After": "7"})
+        self.log_events(1)
+        with mock.patch("python_playground.utils.audit_log_helper.time.sleep") as sleep:
+            self.assertEqual(self.audit_logger.send_batch(), {"ok": True})
+        sleep.assert_called_once_with(7.0)
+        self.assertEqual(len(self.stub.bodies), 2)
+
+    def test_gives_up_after_max_retries(self) -> None:
+        self.serve((503, None))
+        self.log_events(3)
+        with self.assertRaises(AuditLogApiError) as raised:
+            self.audit_logger.send_batch()
+        self.assertEqual(raised.exception.status_code, 503)
+        self.assertEqual(len(raised.exception.failed_entries), 3)
+        # The first attempt and `max_retries` retries.
+        self.assertEqual(len(self.stub.bodies), 3)
+        self.assertEqual(self.audit_logger.metrics.counter("retries"), 2)
+        # Kept for the next `send_batch()`.
+        self.assertEqual(len(self.audit_logger.audit_log_entries), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
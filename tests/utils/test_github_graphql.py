@@ -0,0 +1,151 @@
+import json
+import re
+import unittest
+from typing import Any, Dict, List, Optional, Tuple
+
+from python_playground.utils.github_graphql import GitHubGraphQLClient
+from python_playground.utils.github_stats import GitHubApiClient
+from tests.stub_server import StubServer
+
+JSON = "application/json; charset=utf-8"
+
+
+def repository_node(owner: str, name: str) -> Dict[str, Any]:
+    return {
+        "nameWithOwner": f"{owner}/{name}",
+        "url": f"https://github.com/{owner}/{name}",
+        "description": None,
+        "pushedAt": "2026-01-05T10:00:00Z",
+        "stargazerCount": 42,
+        "forkCount": 7,
+        "issues": {"totalCount": 3},
+        "pullRequests": {"totalCount": 2},
+    }
+
+
+def user_node(login: str) -> Dict[str, Any]:
+    return {
+        "__typename": "User",
+        "login": login,
+        "databaseId": 583231,
+        "id": "MDQ6VXNlcjU4MzIzMQ==",
+        "avatarUrl": "https://avatars.githubusercontent.com/u/583231?v=4",
+        "url": f"https://github.com/{login}",
+        "isSiteAdmin": False,
+        "name": "The Octocat",
+        "company": "@github",
+        "websiteUrl": "https://github.blog",
+        "location": "San Francisco",
+        "email": "",
+        "isHireable": None,
+        "bio": None,
+        "twitterUsername": None,
+        "createdAt": "2011-01-25T18:44:36Z",
+        "updatedAt": "2026-01-05T10:00:00Z",
+        "repositories": {"totalCount": 8},
+        "gists": {"totalCount": 8},
+        "followers": {"totalCount": 100},
+        "following": {"totalCount": 9},
+    }
+
+
+class GitHubGraphQLClientTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.stub = StubServer()
+        self.stub.__enter__()
+        self.addCleanup(self.stub.__exit__)
+        self.rest_client = GitHubApiClient("octocat", "", "", "user_info")
+        self.rest_client.base_url = self.stub.url
+        self.addCleanup(self.rest_client.session.close)
+        self.client = GitHubGraphQLClient(self.rest_client, batch_size=2)
+        self.queries: List[Tuple[str, Dict[str, str]]] = []
+
+    def serve(self, errors: Optional[List[Dict[str, Any]]] = None) -> None:
+        """Answer every aliased field, `None` for the `missing` user or repository."""
+
+        def respond(body: bytes) -> Tuple[int, bytes]:
+            request = json.loads(body)
+            variables = request["variables"]
+            self.queries.append((request["query"], variables))
+            data: Dict[str, Any] = {}
+            for alias, field in re.findall(r"(i\d+): (\w+)\(", request["query"]):
+                index = alias[1:]
+                if field == "user":
+                    login = variables[f"login{index}"]
+                    data[alias] = user_node(login) if login != "missing" else None
+                else:
+                    owner, name = variables[f"owner{index}"], variables[f"name{index}"]
+                    data[alias] = repository_node(owner, name) if name != "missing" else None
+            return 200, json.dumps({"data": data, "errors": errors or []}).encode()
+
+        self.stub.route("/graphql", respond, content_type=JSON, method="POST")
+
+    def test_batches_lookups_into_aliased_queries(self) -> None:
+        self.serve()
+        repositories = self.client.get_repositories(
+            ["octocat/hello-world", "octocat/spoon-knife", "octocat/hello-world", "github/docs"]
+        )
+        self.assertEqual(
+            list(repositories), ["octocat/hello-world", "octocat/spoon-knife", "github/docs"]
+        )
+        # Duplicates are only looked up once, `batch_size` aliases per query.
+        self.assertEqual(self.stub.requests, ["/graphql", "/graphql"])
+        first, second = self.queries
+        self.assertIn("query($owner0: String!, $name0: String!, $owner1:", first[0])
+        self.assertIn("i0: repository(owner: $owner0, name: $name0)", first[0])
+        self.assertIn("i1: repository(owner: $owner1, name: $name1)", first[0])
+        # The numbering continues, user input only ever is a variable.
+        self.assertIn("i2: repository(owner: $owner2, name: $name2)", second[0])
+        self.assertEqual(second[1], {"owner2": "github", "name2": "docs"})
+        self.assertNotIn("octocat", first[0])
+
+    def test_maps_repositories_onto_the_rest_model(self) -> None:
+        self.serve()
+        repository = self.client.get_repositories(["octocat/hello-world"])["octocat/hello-world"]
+        assert repository is not None
+        self.assertEqual(repository.full_name, "octocat/hello-world")
+        self.assertEqual(str(repository.html_url), "https://github.com/octocat/hello-world")
+        self.assertEqual(repository.stargazers_count, 42)
+        self.assertEqual(repository.forks_count, 7)
+        # Issues and pull requests, like the REST API counts them.
+        self.assertEqual(repository.open_issues_count, 5)
+        self.assertEqual(repository.pushed_at, "2026-01-05T10:00:00Z")
+
+    def test_maps_users_onto_the_rest_model(self) -> None:
+        self.serve()
+        user = self.client.get_users(["octocat"])["octocat"]
+        assert user is not None
+        self.assertEqual(user.id, 583231)
+        self.assertEqual(user.node_id, "MDQ6VXNlcjU4MzIzMQ==")
+        self.assertEqual(str(user.url), f"{self.stub.url}/users/octocat")
+        self.assertEqual(
+            user.following_url, f"{self.stub.url}/users/octocat/following{{/other_user}}"
+        )
+        self.assertEqual(user.type, "User")
+        self.assertEqual(str(user.blog), "https://github.blog/")
+        # A private email is an empty string in GraphQL and null in REST.
+        self.assertIsNone(user.email)
+        self.assertEqual(
+            (user.public_repos, user.public_gists, user.followers, user.following), (8, 8, 100, 9)
+        )
+
+    def test_items_that_were_not_found_are_none(self) -> None:
+        not_found = {"type": "NOT_FOUND", "path": ["i1"], "message": "Could not resolve to a User"}
+        self.serve(errors=[not_found])
+        users = self.client.get_users(["octocat", "missing"])
+        self.assertIsNotNone(users["octocat"])
+        self.assertIsNone(users["missing"])
+
+    def test_errors_without_a_path_fail_the_query(self) -> None:
+        self.serve(errors=[{"message": 'Parse error on "}" (RCURLY) at [1, 2]'}])
+        with self.assertRaisesRegex(Exception, "GraphQL query failed: .*Parse error"):
+            self.client.get_users(["octocat"])
+
+    def test_a_response_without_data_fails_the_query(self) -> None:
+        self.stub.route("/graphql", b'{"data": null}', content_type=JSON, method="POST")
+        with self.assertRaisesRegex(Exception, "GraphQL query failed"):
+            self.client.query("{ viewer { login } }")
+
+
+if __name__ == "__main__":
+    unittest.main()
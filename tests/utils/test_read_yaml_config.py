@@ -0,0 +1,157 @@
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import time
+import unittest
+from typing import Any, Callable, Dict, List
+from unittest import mock
+
+import yaml
+
+from python_playground.models.project_config import ProjectConfig
+from python_playground.utils.read_yaml_config import ConfigManager
+
+
+def config_data(version: int) -> Dict[str, Any]:
+    app = {"name": f"App{version}", "version": f"{version}.0.0", "description": None, "mode": None}
+    return {"app": app, "environments": None}
+
+
+class ConfigManagerTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = self.enterContext(tempfile.TemporaryDirectory())
+        self.path = os.path.join(directory, "config.yaml")
+        # The manager keeps its state on the class.
+        self.addCleanup(self.reset)
+        self.addCleanup(ConfigManager.stop_watching)
+        self.reset()
+        self.stdout = self.enterContext(contextlib.redirect_stdout(io.StringIO()))
+
+    @staticmethod
+    def reset() -> None:
+        ConfigManager._config = None
+        ConfigManager._cache.clear()
+        ConfigManager._subscribers.clear()
+
+    def write(self, data: Any) -> None:
+        """Replace the file, like editors and deployments do. Strings are written as they are."""
+        with open(f"{self.path}.tmp", "w") as f:
+            if isinstance(data, str):
+                f.write(data)
+            else:
+                yaml.safe_dump(data, f)
+        os.replace(f"{self.path}.tmp", self.path)
+
+    def subscribe(self) -> List[ProjectConfig]:
+        configs: List[ProjectConfig] = []
+        self.addCleanup(ConfigManager.subscribe(configs.append))
+        return configs
+
+    def version(self) -> str:
+        config = ConfigManager.get_config()
+        assert config is not None and config.app is not None
+        return config.app.version
+
+
+class LoadConfigTest(ConfigManagerTestCase):
+    def test_an_unchanged_file_is_not_parsed_again(self) -> None:
+        self.write(config_data(1))
+        with mock.patch("yaml.safe_load", wraps=yaml.safe_load) as load:
+            config = ConfigManager.load_config(self.path)
+            self.assertIs(ConfigManager.load_config(self.path), config)
+            # Touched, but with the same content.
+            os.utime(self.path, ns=(time.time_ns(), time.time_ns() + 10**9))
+            self.assertIs(ConfigManager.load_config(self.path), config)
+        self.assertEqual(load.call_count, 1)
+
+    def test_a_changed_file_is_reloaded_and_announced(self) -> None:
+        configs = self.subscribe()
+        self.write(config_data(1))
+        ConfigManager.load_config(self.path)
+        self.write(config_data(2))
+        ConfigManager.load_config(self.path)
+        self.assertEqual(self.version(), "2.0.0")
+        self.assertEqual(
+            [config.app.version for config in configs if config.app], ["1.0.0", "2.0.0"]
+        )
+
+    def test_an_invalid_edit_keeps_the_current_config(self) -> None:
+        self.write(config_data(1))
+        ConfigManager.load_config(self.path)
+        configs = self.subscribe()
+        self.write({"app": {"name": "App2"}})
+        with mock.patch("yaml.safe_load", wraps=yaml.safe_load) as load:
+            self.assertIsNone(ConfigManager.load_config(self.path))
+            self.assertIsNone(ConfigManager.load_config(self.path))
+        # Parsed and reported once, until the file changes again.
+        self.assertEqual(load.call_count, 1)
+        self.assertEqual(self.stdout.getvalue().count("'field': 'version'"), 1)
+        self.assertEqual(self.version(), "1.0.0")
+        self.assertEqual(configs, [])
+
+    def test_unsubscribe(self) -> None:
+        configs: List[ProjectConfig] = []
+        unsubscribe = ConfigManager.subscribe(configs.append)
+        unsubscribe()
+        self.write(config_data(1))
+        ConfigManager.load_config(self.path)
+        self.assertEqual(configs, [])
+
+
+class WatchTest(ConfigManagerTestCase):
+    def wait_for(self, condition: Callable[[], bool], timeout: float = 5.0) -> None:
+        deadline = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > deadline:
+                self.fail("Timed out waiting for the config to reload.")
+            time.sleep(0.01)
+
+    def test_reloads_valid_edits_only(self) -> None:
+        self.write(config_data(1))
+        ConfigManager.watch(self.path, interval=0.01)
+        configs = self.subscribe()
+
+        self.write(config_data(2))
+        self.wait_for(lambda: self.version() == "2.0.0")
+        self.write("app: [not, a, mapping")
+        self.write({"app": {"name": "App3"}})
+        self.write(config_data(4))
+        self.wait_for(lambda: self.version() == "4.0.0")
+        # Neither the syntax error nor the invalid version were announced.
+        self.assertEqual(
+            [config.app.version for config in configs if config.app], ["2.0.0", "4.0.0"]
+        )
+
+    def test_readers_never_see_a_partial_config(self) -> None:
+        self.write(config_data(1))
+        ConfigManager.watch(self.path, interval=0.001)
+        stop = threading.Event()
+        torn: List[str] = []
+
+        def read() -> None:
+            while not stop.is_set():
+                app = ConfigManager._config.app if ConfigManager._config else None
+                if app is not None and app.name[3:] != app.version.split(".")[0]:
+                    torn.append(app.version)
+
+        reader = threading.Thread(target=read)
+        reader.start()
+        try:
+            for version in range(2, 20):
+                self.write(config_data(version))
+                self.wait_for(lambda: self.version() == f"{version}.0.0")
+        finally:
+            stop.set()
+            reader.join()
+        self.assertEqual(torn, [])
+
+    def test_an_invalid_file_cant_be_watched(self) -> None:
+        self.write({"app": {"name": "App1"}})
+        with self.assertRaisesRegex(ValueError, "Invalid config file"):
+            ConfigManager.watch(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+from typing import Dict, List
+
+from python_playground.web_scraping.article_writers import (
+    ArticleWriter,
+    CsvArticleWriter,
+    NdjsonArticleWriter,
+    ParquetArticleWriter,
+    parquet,
+)
+
+FIELDNAMES = ["title", "link", "published"]
+
+
+def articles(*numbers: int) -> List[Dict[str, str]]:
+    return [
+        {"title": f"Article {n}", "link": f"https://rschu.me/article-{n}", "published": "Jan 5"}
+        for n in numbers
+    ]
+
+
+class TextArticleWriterTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = self.enterContext(tempfile.TemporaryDirectory())
+
+    def test_placeholder_methods_are_abstract(self) -> None:
+        with self.assertRaises(TypeError):
+            ArticleWriter("articles", FIELDNAMES)  # type: ignore[abstract]
+
+    def test_skips_articles_written_by_a_previous_run(self) -> None:
+        for writer_class in (CsvArticleWriter, NdjsonArticleWriter):
+            path = os.path.join(self.directory, f"articles.{writer_class.extension}")
+            with writer_class(path, FIELDNAMES) as writer:
+                for article in articles(1, 2):
+                    writer.write(article)
+            with writer_class(path, FIELDNAMES) as writer:
+                written = [writer.write(article) for article in articles(2, 3)]
+            self.assertEqual(written, [False, True])
+            with open(path, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+            self.assertEqual(len(lines), 4 if writer_class is CsvArticleWriter else 3)
+
+
+@unittest.skipIf(parquet is None, "requires pyarrow")
+class ParquetArticleWriterTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = self.enterContext(tempfile.TemporaryDirectory())
+        self.path = os.path.join(self.directory, "articles.parquet")
+        with ParquetArticleWriter(self.path, FIELDNAMES) as writer:
+            for article in articles(1, 2):
+                writer.write(article)
+
+    def links(self) -> List[str]:
+        return [str(link) for link in parquet.read_table(self.path).column("link").to_pylist()]
+
+    def test_appends_to_the_existing_file(self) -> None:
+        with ParquetArticleWriter(self.path, FIELDNAMES) as writer:
+            written = [writer.write(article) for article in articles(2, 3)]
+        self.assertEqual(written, [False, True])
+        self.assertEqual(len(self.links()), 3)
+        self.assertEqual(sorted(os.listdir(self.directory)), ["articles.parquet"])
+
+    def test_a_crash_before_close_keeps_the_existing_file(self) -> None:
+        crashed = ParquetArticleWriter(self.path, FIELDNAMES, flush_every=1)
+        crashed.write(articles(3)[0])
+        crashed.flush()
+        # No `close()`, as if the process had crashed.
+        self.assertEqual(len(self.links()), 2)
+
+        with ParquetArticleWriter(self.path, FIELDNAMES) as writer:
+            writer.write(articles(3)[0])
+        self.assertEqual(len(self.links()), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import threading
+import unittest
+from typing import List
+
+from python_playground.web_scraping.driver_pool import DriverPool
+
+
+class FakeDriver:
+    def __init__(self) -> None:
+        self.quit_calls = 0
+        self.resets = 0
+
+    def quit(self) -> None:
+        self.quit_calls += 1
+
+
+class DriverPoolTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.created: List[FakeDriver] = []
+
+    def factory(self) -> FakeDriver:
+        driver = FakeDriver()
+        self.created.append(driver)
+        return driver
+
+    def test_reuses_and_resets_drivers(self) -> None:
+        def reset(driver: FakeDriver) -> None:
+            driver.resets += 1
+
+        with DriverPool(2, self.factory, reset=reset) as pool:
+            for _ in range(3):
+                with pool.driver() as driver:
+                    pass
+        self.assertEqual(self.created, [driver])
+        self.assertEqual(driver.resets, 3)
+        self.assertEqual(driver.quit_calls, 1)
+
+    def test_recycles_a_driver_after_max_uses(self) -> None:
+        with DriverPool(1, self.factory, max_uses=2) as pool:
+            for _ in range(5):
+                with pool.driver():
+                    pass
+            self.assertEqual(pool.recycled, 2)
+        self.assertEqual(len(self.created), 3)
+        self.assertEqual([driver.quit_calls for driver in self.created], [1, 1, 1])
+
+    def test_replaces_a_driver_that_fails_to_reset(self) -> None:
+        def reset(driver: FakeDriver) -> None:
+            raise RuntimeError("The browser crashed.")
+
+        with DriverPool(1, self.factory, reset=reset) as pool:
+            for _ in range(2):
+                with pool.driver():
+                    pass
+        self.assertEqual(len(self.created), 2)
+        self.assertEqual([driver.quit_calls for driver in self.created], [1, 1])
+
+    def test_frees_the_slot_when_the_factory_fails(self) -> None:
+        def failing_factory() -> FakeDriver:
+            raise RuntimeError("Chrome didn't start.")
+
+        pool = DriverPool(1, failing_factory)
+        with self.assertRaises(RuntimeError):
+            with pool.driver():
+                pass
+        pool.factory = self.factory
+        with pool.driver() as driver:
+            self.assertIs(driver, self.created[0])
+        pool.close()
+
+    def test_never_exceeds_its_size(self) -> None:
+        in_use: List[FakeDriver] = []
+        peak = 0
+        lock = threading.Lock()
+
+        def work(pool: DriverPool) -> None:
+            nonlocal peak
+            for _ in range(20):
+                with pool.driver() as driver:
+                    with lock:
+                        self.assertNotIn(driver, in_use)
+                        in_use.append(driver)
+                        peak = max(peak, len(in_use))
+                    with lock:
+                        in_use.remove(driver)
+
+        with DriverPool(3, self.factory, max_uses=7) as pool:
+            threads = [threading.Thread(target=work, args=(pool,)) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertLessEqual(peak, 3)
+        self.assertTrue(all(driver.quit_calls == 1 for driver in self.created))
+
+
+if __name__ == "__main__":
+    unittest.main()
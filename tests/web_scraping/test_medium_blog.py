@@ -0,0 +1,84 @@
+import shutil
+import unittest
+from typing import Any, Dict, List
+
+from python_playground.web_scraping.medium_blog import (
+    create_driver,
+    iter_blog_articles,
+    reset_driver,
+)
+from tests.stub_server import StubServer
+
+# A static stand-in for a rendered Medium blog, with the heavy assets Chrome shouldn't load.
+BLOG_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta property="al:android:package" content="com.medium.reader">
+<style>
+@font-face { font-family: "Serif"; src: url("/assets/serif.woff2") format("woff2"); }
+body { font-family: "Serif"; }
+</style>
+</head>
+<body>
+<img src="/assets/cover.png" alt="">
+<article><a href="/first-article-1a2b"><h2>First article</h2></a><p>Dec 28, 2021</p></article>
+<article><a href="/second-article-3c4d"><h2>Second article</h2></a><p>Jan 5, 2024</p></article>
+</body>
+</html>
+"""
+
+
+@unittest.skipIf(shutil.which("chromedriver") is None, "requires Chrome and chromedriver")
+class SeleniumTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.stub = StubServer()
+        self.stub.__enter__()
+        self.addCleanup(self.stub.__exit__)
+        self.stub.route("/blog", BLOG_PAGE.encode())
+        self.stub.route("/assets/cover.png", b"", content_type="image/png")
+        self.stub.route("/assets/serif.woff2", b"", content_type="font/woff2")
+        self.blog_url = f"{self.stub.url}/blog"
+
+    def scrape(self, block_resources: bool) -> List[Dict[str, str]]:
+        driver: Any = create_driver(block_resources)
+        self.addCleanup(driver.quit)
+        return list(iter_blog_articles(driver, self.blog_url, scroll_timeout=0.5))
+
+    def test_extracts_the_articles(self) -> None:
+        self.assertEqual(
+            self.scrape(block_resources=True),
+            [
+                {
+                    "title": "First article",
+                    "link": f"{self.stub.url}/first-article-1a2b",
+                    "published": "Dec 28, 2021",
+                },
+                {
+                    "title": "Second article",
+                    "link": f"{self.stub.url}/second-article-3c4d",
+                    "published": "Jan 5, 2024",
+                },
+            ],
+        )
+
+    def test_blocks_images_and_fonts(self) -> None:
+        self.scrape(block_resources=True)
+        self.assertIn("/blog", self.stub.requests)
+        self.assertNotIn("/assets/cover.png", self.stub.requests)
+        self.assertNotIn("/assets/serif.woff2", self.stub.requests)
+
+    def test_loads_everything_without_blocking(self) -> None:
+        self.scrape(block_resources=False)
+        self.assertIn("/assets/cover.png", self.stub.requests)
+
+    def test_reset_driver_drops_the_page(self) -> None:
+        driver: Any = create_driver()
+        self.addCleanup(driver.quit)
+        articles = list(iter_blog_articles(driver, self.blog_url, scroll_timeout=0.5))
+        self.assertEqual(len(articles), 2)
+        reset_driver(driver)
+        self.assertEqual(driver.current_url, "about:blank")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+import os
+import tempfile
+import unittest
+from typing import Dict, List, Optional
+from unittest import mock
+
+from python_playground.web_scraping import medium_blog
+from python_playground.web_scraping.medium_http import (
+    MediumHttpError,
+    create_client,
+    feed_url,
+    scrape_blog_http,
+)
+from tests.stub_server import StubServer, fixture
+
+JSON = "application/json; charset=utf-8"
+RSS = "text/xml; charset=UTF-8"
+
+
+class MediumHttpTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.stub = StubServer()
+        self.stub.__enter__()
+        self.addCleanup(self.stub.__exit__)
+        self.client = create_client()
+        self.addCleanup(self.client.close)
+        self.blog_url = f"{self.stub.url}/blog"
+
+    def serve_json_stream(self) -> None:
+        self.stub.route("/blog/latest", fixture("medium", "latest_page_1.txt"), content_type=JSON)
+        for page in ("2", "3"):
+            self.stub.route(
+                "/blog/latest",
+                fixture("medium", f"latest_page_{page}.txt"),
+                content_type=JSON,
+                query={"page": page},
+            )
+
+    def serve_feed(self, name: str = "feed.xml") -> None:
+        self.stub.route("/blog/latest", b"Forbidden", status=403)
+        self.stub.route("/blog/feed", fixture("medium", name), content_type=RSS)
+
+
+class ScrapeBlogHttpTest(MediumHttpTestCase):
+    def test_pages_through_the_json_stream(self) -> None:
+        self.serve_json_stream()
+
+        articles_data, complete = scrape_blog_http(self.blog_url, self.client)
+
+        self.assertTrue(complete)
+        self.assertEqual(len(articles_data), 57)
+        self.assertEqual(len({article["link"] for article in articles_data}), 57)
+        self.assertEqual(
+            articles_data[0],
+            {
+                "title": articles_data[0]["title"],
+                "link": f"{self.blog_url}/{articles_data[0]['link'].rsplit('/', 1)[1]}",
+                "published": "Dec 31, 2023",
+            },
+        )
+        self.assertEqual(len(self.stub.requests), 3)
+        self.assertIn("to=", self.stub.requests[2])
+
+    def test_stops_after_max_pages(self) -> None:
+        self.serve_json_stream()
+
+        articles_data, complete = scrape_blog_http(self.blog_url, self.client, max_pages=2)
+
+        self.assertFalse(complete)
+        self.assertEqual(len(articles_data), 50)
+
+    def test_falls_back_to_the_rss_feed(self) -> None:
+        self.serve_feed()
+
+        articles_data, complete = scrape_blog_http(self.blog_url, self.client)
+
+        self.assertFalse(complete)
+        self.assertEqual(len(articles_data), 10)
+        # Links without the `?source=rss...` tracking query.
+        self.assertTrue(articles_data[0]["link"].startswith("https://rschu.me/"))
+        self.assertNotIn("?", articles_data[0]["link"])
+        self.assertEqual(articles_data[0]["published"], "Dec 31, 2023")
+
+    def test_rejects_other_feeds(self) -> None:
+        self.serve_feed("wordpress_feed.xml")
+
+        with self.assertRaisesRegex(MediumHttpError, "Not a Medium RSS feed"):
+            scrape_blog_http(self.blog_url, self.client)
+
+    def test_raises_without_stream_and_feed(self) -> None:
+        with self.assertRaises(MediumHttpError):
+            scrape_blog_http(self.blog_url, self.client)
+
+    def test_feed_url(self) -> None:
+        self.assertEqual(feed_url("https://medium.com/@rschu"), "https://medium.com/feed/@rschu")
+        self.assertEqual(feed_url("https://rschu.me"), "https://rschu.me/feed")
+
+
+class EngineTest(MediumHttpTestCase):
+    def scrape(self, engine: str) -> Optional[List[Dict[str, str]]]:
+        return medium_blog.scrape_blog_without_browser(self.blog_url, engine, self.client)
+
+    def test_auto_uses_the_complete_json_stream(self) -> None:
+        self.serve_json_stream()
+
+        self.assertEqual(len(self.scrape("auto") or []), 57)
+
+    def test_auto_leaves_partial_feeds_to_selenium(self) -> None:
+        self.serve_feed()
+
+        self.assertIsNone(self.scrape("auto"))
+
+    def test_http_accepts_the_feed(self) -> None:
+        self.serve_feed()
+
+        self.assertEqual(len(self.scrape("http") or []), 10)
+
+    def test_http_raises_for_other_feeds(self) -> None:
+        self.serve_feed("wordpress_feed.xml")
+
+        self.assertIsNone(self.scrape("auto"))
+        with self.assertRaises(MediumHttpError):
+            self.scrape("http")
+
+    def test_selenium_sends_no_requests(self) -> None:
+        self.serve_json_stream()
+
+        self.assertIsNone(self.scrape("selenium"))
+        self.assertEqual(self.stub.requests, [])
+
+    def test_batch_mode_falls_back_to_selenium(self) -> None:
+        self.serve_feed()
+        selenium_article = {"title": "Title", "link": f"{self.blog_url}/title", "published": "-"}
+        output_dir = self.enterContext(tempfile.TemporaryDirectory())
+
+        with (
+            mock.patch.object(medium_blog, "is_valid_url", return_value=True),
+            mock.patch.object(medium_blog, "create_driver") as create_driver,
+            mock.patch.object(
+                medium_blog, "iter_blog_articles", return_value=iter([selenium_article])
+            ) as iter_blog_articles,
+            mock.patch("sys.stdout"),
+        ):
+            medium_blog.scrape_blogs([self.blog_url], 1, output_dir, "all.csv")
+
+        create_driver.assert_called_once()
+        iter_blog_articles.assert_called_once()
+        with open(os.path.join(output_dir, "all.csv")) as f:
+            self.assertEqual(len(f.readlines()), 2)
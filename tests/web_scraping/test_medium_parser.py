@@ -0,0 +1,48 @@
+import unittest
+from datetime import date
+
+from python_playground.web_scraping.medium_parser import (
+    DATE_PATTERN,
+    available_backends,
+    normalize_date,
+    parse_articles,
+)
+
+BLOG_URL = "https://rschu.me"
+HTML = """
+<article><a href="/older-article-1a2b"><h2>Older article</h2></a><span>Dec 28, 2021</span></article>
+<article><a href="/new-article-3c4d?source=rss"><h2>New article</h2></a><span>Jan 5</span></article>
+<article><h2>Undated article</h2></article>
+"""
+
+
+class NormalizeDateTest(unittest.TestCase):
+    def test_adds_the_year_to_dates_of_the_current_year(self) -> None:
+        for text, expected in (("Jan 5", "Jan 5, 2026"), ("Dec 28, 2021", "Dec 28, 2021")):
+            match = DATE_PATTERN.search(f"· {text} ·")
+            assert match is not None
+            self.assertEqual(normalize_date(match, 2026), expected)
+
+
+class ParseArticlesTest(unittest.TestCase):
+    def test_backends_extract_the_same_dates(self) -> None:
+        expected = [
+            {
+                "title": "Older article",
+                "link": f"{BLOG_URL}/older-article-1a2b",
+                "published": "Dec 28, 2021",
+            },
+            {
+                "title": "New article",
+                "link": f"{BLOG_URL}/new-article-3c4d",
+                "published": f"Jan 5, {date.today().year}",
+            },
+            {"title": "Undated article", "link": "", "published": "not-found"},
+        ]
+        for backend in available_backends():
+            with self.subTest(backend=backend):
+                self.assertEqual(parse_articles(HTML, BLOG_URL, backend), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()